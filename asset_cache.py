@@ -0,0 +1,96 @@
+"""
+Shinchan Jungle Run - Asset Cache
+Decoding the large PNGs and scaling them down is the slowest part of
+startup, so scaled results are written to disk as raw pixel buffers
+keyed by the source file's path, size and modification time (one stat,
+no reading it) and the target size. Later launches memory-map those
+buffers instead of decoding again. Every surface handed back is
+converted to the display format so blits don't convert per pixel.
+"""
+
+import hashlib
+import mmap
+import os
+import pygame
+
+CACHE_DIR = os.path.join('assets', '.cache')
+CACHE_FORMATS = ('RGBA', 'RGB')
+
+
+def file_key(path):
+    """Cache key for a source file; raises FileNotFoundError when it's missing"""
+    info = os.stat(path)
+    identity = f"{os.path.abspath(path)}:{info.st_size}:{info.st_mtime_ns}"
+    return hashlib.sha1(identity.encode()).hexdigest()
+
+
+def cache_path(key, size, fmt):
+    return os.path.join(CACHE_DIR, f"{key}_{size[0]}x{size[1]}.{fmt.lower()}")
+
+
+def to_display_format(surface, alpha):
+    """Convert to the display's pixel format (only possible once a display mode is set)"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def read_cached(key, size):
+    """Map a cached pixel buffer back into a surface, or None on a miss"""
+    for fmt in CACHE_FORMATS:
+        path = cache_path(key, size, fmt)
+        try:
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    raw = pygame.image.frombuffer(buffer, size, fmt)
+                    alpha = fmt == 'RGBA'
+                    surface = to_display_format(raw, alpha)
+                    if surface is raw:
+                        surface = raw.copy()  # Don't keep pointing at the mapping
+                    del raw
+            return surface
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError, BufferError, pygame.error):
+            return None  # Truncated or unreadable entry, rebuild it
+    return None
+
+
+def write_cached(key, surface, alpha):
+    """Store a surface's pixels; failures only cost the cache, never the game"""
+    fmt = 'RGBA' if alpha else 'RGB'
+    path = cache_path(key, surface.get_size(), fmt)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(pygame.image.tobytes(surface, fmt))
+        os.replace(tmp_path, path)
+    except (OSError, pygame.error):
+        pass
+
+
+def load_image(path, size):
+    """Load an image file scaled to size, going through the disk cache"""
+    key = file_key(path)
+    surface = read_cached(key, size)
+    if surface is not None:
+        return surface
+
+    image = pygame.image.load(path)
+    alpha = bool(image.get_flags() & pygame.SRCALPHA)
+    image = pygame.transform.scale(image, size)
+    write_cached(key, image, alpha)
+    return to_display_format(image, alpha)
+
+
+def cached_surface(key_parts, size, build):
+    """Return a generated surface (e.g. a placeholder), building it only on a cache miss"""
+    key = hashlib.sha1(repr(key_parts).encode()).hexdigest()
+    surface = read_cached(key, size)
+    if surface is not None:
+        return surface
+
+    surface = build()
+    write_cached(key, surface, True)
+    return to_display_format(surface, True)
@@ -0,0 +1,169 @@
+"""
+Shinchan Jungle Run - Batch Simulation Runner
+Sweeps tuning values across a process pool of headless seeded bot runs
+and streams one CSV row per run as results arrive.
+
+Example:
+    python batch.py --runs 2000 --gravity 1 1.2 --jump-force -18 -20 --out sweep.csv
+    python batch.py --config tuning.toml --speed-step 0.5 0.75   # Sweep around a config file
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from engine import run_headless, use_dummy_drivers
+from settings import TUNING
+from bot import Autopilot
+from config import ConfigError, GameConfig, load_config
+
+CHUNK_SIZE = 50  # Runs per task, keeps pickling overhead small next to the simulation
+MAX_STEPS = 20000  # Safety stop for a run that never ends
+
+RESULT_FIELDS = ('seed', 'outcome', 'score', 'choco_count', 'pudding_count', 'distance', 'frames')
+
+
+def reaction_bot(game):
+    """Jump when the nearest obstacle is about to reach the player"""
+    reach = 60 + game.game_speed * 6
+    for obstacle in game.obstacles:
+        gap = obstacle.rect.x - game.player_x
+        if 0 < gap < reach:
+            return True
+    return False
+
+
+def run_chunk(tuning, seeds, bot='reaction'):
+    """Play one bot run per seed with the given tuning, returns result tuples"""
+    results = []
+    pilot = Autopilot(tuning) if bot == 'planner' else None
+    for seed in seeds:
+        if pilot is not None:
+            pilot.reset()
+        controller = pilot or reaction_bot
+        game = run_headless(controller=controller, max_steps=MAX_STEPS, seed=seed, tuning=tuning)
+        outcome = 'won' if game.game_won else 'lost' if game.game_over else 'timeout'
+        results.append((seed, outcome, game.score, game.choco_count, game.pudding_count,
+                        game.distance, game.frame))
+    return results
+
+
+def parameter_grid(sweeps):
+    """Every combination of the swept values, as tuning dicts"""
+    names = list(sweeps)
+    return [dict(zip(names, values)) for values in itertools.product(*(sweeps[name] for name in names))]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * p // 100)] if values else 0
+
+
+def run_sweep(sweeps, runs, first_seed=0, workers=None, out=None, bot='reaction'):
+    """Run every combination, streaming rows to out, returns {combo index: [result tuples]}"""
+    combos = parameter_grid(sweeps)
+    names = list(sweeps)
+    seeds = list(range(first_seed, first_seed + runs))
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, len(seeds), CHUNK_SIZE)]
+    results = {index: [] for index in range(len(combos))}
+
+    writer = None
+    if out is not None:
+        writer = csv.writer(out)
+        writer.writerow(('combo',) + tuple(names) + RESULT_FIELDS)
+
+    use_dummy_drivers()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_chunk, combo, chunk, bot): index
+                   for index, combo in enumerate(combos) for chunk in chunks}
+        for future in as_completed(futures):
+            index = futures[future]
+            rows = future.result()
+            results[index].extend(rows)
+            if writer is not None:
+                combo = combos[index]
+                prefix = (index,) + tuple(combo[name] for name in names)
+                writer.writerows(prefix + row for row in rows)
+                out.flush()
+    return combos, results
+
+
+def number(text):
+    """Parse a sweep value, keeping whole numbers as ints like the defaults"""
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep tuning values over headless bot runs")
+    parser.add_argument('--runs', type=positive_int, default=1000, help='seeded runs per combination')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--workers', type=positive_int, help='worker processes (default: one per core)')
+    parser.add_argument('--out', metavar='PATH', help='CSV file to stream per-run results into')
+    parser.add_argument('--bot', choices=('reaction', 'planner'), default='reaction',
+                        help='reaction: jump when an obstacle gets close; planner: the look-ahead autopilot')
+    parser.add_argument('--config', metavar='PATH',
+                        help='TOML or JSON file of tuning values used for everything not swept')
+    for name, default in TUNING.items():
+        parser.add_argument('--' + name.replace('_', '-'), type=number, nargs='+',
+                            metavar='V', help=f"values to sweep (default {default}, or the config's)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    base = TUNING
+    if args.config:
+        try:
+            base = load_config(args.config).as_dict()
+        except ConfigError as e:
+            print(f"Could not load config: {e}")
+            return 2
+    sweeps = {name: getattr(args, name) or [base[name]] for name in TUNING}
+    try:
+        for name, values in sweeps.items():
+            for value in values:
+                GameConfig({name: value})  # Same checks as a config file, before any worker starts
+    except ValueError as e:
+        print(f"Invalid sweep value: {e}")
+        return 2
+    start = time.perf_counter()
+
+    out = open(args.out, 'w', newline='') if args.out else None
+    try:
+        combos, results = run_sweep(sweeps, args.runs, args.first_seed, args.workers, out, args.bot)
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    swept = [name for name in sweeps if len(sweeps[name]) > 1]
+    for index, combo in enumerate(combos):
+        rows = results[index]
+        wins = sum(1 for row in rows if row[1] == 'won')
+        scores = [row[2] for row in rows]
+        distances = [row[5] for row in rows]
+        label = ', '.join(f"{name}={combo[name]}" for name in swept) or 'defaults'
+        print(f"[{index}] {label}: win rate {wins / len(rows):.1%}, "
+              f"score p50/p95 {percentile(scores, 50)}/{percentile(scores, 95)}, "
+              f"distance p5/p50 {percentile(distances, 5):.0f}/{percentile(distances, 50):.0f}")
+    total = len(combos) * args.runs
+    print(f"{total} runs in {elapsed:.1f}s ({total / elapsed:.0f} runs/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
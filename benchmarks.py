@@ -0,0 +1,278 @@
+"""
+Shinchan Jungle Run - Performance Benchmarks
+Times the simulation step, a full render frame, text and button
+drawing, asset loading and a complete seeded run, all headless under
+the SDL dummy drivers. Every case repeats until a sample takes at least
+MIN_SAMPLE_MS and takes the median of several samples, and the whole
+suite runs in interleaved rounds whose median is reported, so a slow
+patch of machine time doesn't land on one case only. Results are
+compared against a JSON baseline and the run fails when a case got
+slower than its threshold allows in every round, which a real slowdown
+does and a noisy stretch of machine time doesn't.
+
+Example:
+    python benchmarks.py --save        # Record a baseline on this machine
+    python benchmarks.py               # Compare against it, exit 1 on a regression
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from engine import GameState, run_headless, use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame
+import asset_cache
+import main as game_main
+from batch import reaction_bot
+from bot import Autopilot
+from fonts import render_text, clear_cache
+from parallax import ParallaxBackground, single_layer
+from render import DirtyRects
+from settings import WIDTH, HEIGHT
+from sounds import load_sound_safe
+from sprites import SpriteBatch
+
+BASELINE_PATH = 'benchmarks.json'
+# Allowed slowdown against the baseline before a case counts as a regression
+THRESHOLDS = {'frame': 0.25, 'startup': 0.50}
+ENTITY_COUNTS = (0, 100, 1000)
+STEPS = 60  # Steps per simulation run, before the level's own obstacles arrive
+MIN_SAMPLE_MS = 10  # Each sample repeats the case until it has run at least this long
+REPEAT = 9  # Samples per case and round, the median is kept
+ROUNDS = 5  # Passes over the whole suite, the median per case is reported
+WIN_SEED = 0  # Seed the reaction bot plays through to the parents
+IMAGES = [
+    ("assets/shinchan_files/jungle_bg.png", (WIDTH, HEIGHT)),
+    ("assets/shinchan_files/shinchan.png", (80, 80)),
+    ("assets/shinchan_files/obstacle.png", (100, 100)),
+]
+SOUNDS = ["assets/sounds/jump.mp3", "assets/sounds/collect.mp3", "assets/sounds/win.mp3"]
+
+
+def measure(run, repeat=REPEAT, setup=None):
+    """Median milliseconds per run() call; setup() runs untimed before every call and its result is passed in"""
+    def sample(number):
+        elapsed = 0.0
+        for _ in range(number):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            run(state) if setup else run()
+            elapsed += time.perf_counter() - start
+        return elapsed * 1000
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # A collection landing in one sample but not another is most of the noise
+    try:
+        number = 1
+        while sample(number) < MIN_SAMPLE_MS:
+            number *= 2
+        return statistics.median(sample(number) / number for _ in range(repeat))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def crowded_game(count):
+    """A game with count entities on screen, placed where the player never touches them"""
+    game = GameState(seed=1)
+    rng = random.Random(count)
+    for i in range(count):
+        pool = game.items if i % 2 else game.obstacles
+        pool.spawn('choco' if i % 2 else 'obstacle', rng.randrange(400, WIDTH), rng.randrange(0, 120), 40, 40)
+    return game
+
+
+def bench_steps(count):
+    def run(game):
+        for _ in range(STEPS):
+            game.update()
+    return measure(run, setup=lambda: crowded_game(count)) / STEPS
+
+
+def bench_render_frame(screen, images):
+    """One in-game frame: background, every entity layer, the HUD and the display flip"""
+    bg_img, player_img, obstacle_img = images
+    background = ParallaxBackground(single_layer(bg_img), (WIDTH, HEIGHT))
+    sprites = SpriteBatch(['items', 'obstacles', 'actors'])
+    tracker = DirtyRects((WIDTH, HEIGHT), enabled=False)
+    game = crowded_game(20)
+
+    def frame():
+        background.draw(screen, game.distance)
+        for item in game.items:
+            sprites['items'].add(obstacle_img, item.rect, item)
+        for obstacle in game.obstacles:
+            sprites['obstacles'].add(obstacle_img, obstacle.rect, obstacle)
+        sprites['actors'].add(player_img, (game.player_x, game.player_y), 'player')
+        sprites.draw(screen, tracker)
+        for i, text in enumerate((f"Score: {game.score}", f"Chocobees: {game.choco_count}",
+                                  f"Puddings: {game.pudding_count}", f"Distance: {game.distance}/2000")):
+            screen.blit(render_text(text, 20, (0, 0, 0)), (20, 20 + 25 * i))
+        tracker.flush()
+    frame()  # Warm the text cache like a running game
+    return measure(frame)
+
+
+def bench_draw_text(screen):
+    def draw():
+        for i in range(10):
+            screen.blit(render_text(f"Score: {i}", 25, (0, 0, 0)), (20, 20))
+    draw()
+    return measure(draw) / 10
+
+
+def bench_draw_button(screen):
+    def draw():
+        for _ in range(10):
+            game_main.draw_button(screen, "START GAME", 300, 250, 200, 60,
+                                  (100, 180, 100), (120, 220, 120), (255, 255, 255))
+    draw()
+    return measure(draw) / 10
+
+
+def bench_load_images(cold):
+    """Load the big images, through an empty disk cache when cold"""
+    def run(cache_dir):
+        asset_cache.CACHE_DIR = cache_dir
+        for path, size in IMAGES:
+            game_main.load_image_safe(path, size)
+
+    original = asset_cache.CACHE_DIR
+    cache_dir = tempfile.mkdtemp(prefix='sjr-bench-')
+    try:
+        if cold:
+            def setup():
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                return cache_dir
+            return measure(run, repeat=5, setup=setup)
+        run(cache_dir)  # Fill the cache once
+        return measure(run, setup=lambda: cache_dir)
+    finally:
+        asset_cache.CACHE_DIR = original
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def bench_load_sounds():
+    def run():
+        for path in SOUNDS:
+            load_sound_safe(path)
+    return measure(run, repeat=5)
+
+
+def bench_win_run():
+    def run():
+        game = run_headless(controller=reaction_bot, seed=WIN_SEED)
+        if not game.game_won:
+            raise RuntimeError(f"Seed {WIN_SEED} no longer reaches the parents")
+    return measure(run)
+
+
+def bench_autopilot():
+    """One autopilot decision against a crowded screen"""
+    game = crowded_game(100)
+    pilot = Autopilot()
+    pilot(game)
+    return measure(lambda: pilot(game))
+
+
+def run_benchmarks(rounds=ROUNDS):
+    """{case: (group, median milliseconds, fastest round's milliseconds)}"""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    images = [game_main.load_image_safe(path, size) for path, size in IMAGES]
+    cases = [(f'sim_step_{count}', 'frame', lambda count=count: bench_steps(count)) for count in ENTITY_COUNTS]
+    cases += [
+        ('render_frame', 'frame', lambda: bench_render_frame(screen, images)),
+        ('draw_text', 'frame', lambda: bench_draw_text(screen)),
+        ('draw_button', 'frame', lambda: bench_draw_button(screen)),
+        ('win_run', 'frame', bench_win_run),
+        ('autopilot_decision', 'frame', bench_autopilot),
+        ('load_images_cold', 'startup', lambda: bench_load_images(cold=True)),
+        ('load_images_warm', 'startup', lambda: bench_load_images(cold=False)),
+        ('load_sounds', 'startup', bench_load_sounds),
+    ]
+    timings = {name: [] for name, group, bench in cases}
+    for _ in range(rounds):
+        for name, group, bench in cases:
+            timings[name].append(bench())
+    clear_cache()
+    pygame.quit()
+    return {name: (group, statistics.median(timings[name]), min(timings[name])) for name, group, bench in cases}
+
+
+def compare(results, baseline, thresholds):
+    """Lines describing each case, and the names of the cases that regressed"""
+    lines = []
+    regressions = []
+    for name, (group, ms, fastest) in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"{name:<18} {ms:>10.4f} ms   (no baseline)")
+            continue
+        change = ms / base - 1 if base else 0.0
+        limit = thresholds[group]
+        flag = ''
+        if base and fastest / base - 1 > limit:  # Even the fastest round is over the limit
+            regressions.append(name)
+            flag = f'  REGRESSION (limit +{limit:.0%})'
+        lines.append(f"{name:<18} {ms:>10.4f} ms   baseline {base:>10.4f} ms  {change:>+7.1%}{flag}")
+    return lines, regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless performance benchmarks")
+    parser.add_argument('--baseline', default=BASELINE_PATH, metavar='PATH',
+                        help=f'JSON baseline to compare with or save to (default {BASELINE_PATH})')
+    parser.add_argument('--save', action='store_true', help='write these results as the new baseline')
+    parser.add_argument('--rounds', type=int, default=ROUNDS,
+                        help=f'passes over the suite, the median of each case is used (default {ROUNDS})')
+    parser.add_argument('--frame-threshold', type=float, default=THRESHOLDS['frame'],
+                        help='allowed slowdown for per-frame cases, as a fraction (default 0.25)')
+    parser.add_argument('--startup-threshold', type=float, default=THRESHOLDS['startup'],
+                        help='allowed slowdown for startup cases, as a fraction (default 0.5)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.rounds < 1:
+        print("--rounds must be at least 1")
+        return 2
+    results = run_benchmarks(args.rounds)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    thresholds = {'frame': args.frame_threshold, 'startup': args.startup_threshold}
+    lines, regressions = compare(results, baseline, thresholds)
+    print('\n'.join(lines))
+
+    if args.save or not baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'pygame': pygame.version.ver,
+                       'results': {name: round(ms, 6) for name, (group, ms, fastest) in results.items()}},
+                      f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Shinchan Jungle Run - Autopilot
+Decides when to press SPACE from the obstacles and items already on
+screen. Every jump the player can make (the single jump, or a double
+jump on any frame of the window) is precomputed once as an arc table
+with a running count of the frames spent above obstacle height, so
+checking a plan against an obstacle is two list lookups. Apart from the
+first sight of a new game speed, deciding allocates nothing.
+
+Run this file directly for a headless win-rate and decisions/second check.
+"""
+
+import sys
+import time
+from array import array
+import pygame
+from levels import jump_arc
+from settings import FRAME_MS, PLAYER_SIZE, OBSTACLE_Y, TUNING
+
+NEVER = 1 << 30  # Window start for "no obstacle coming"
+
+
+def clear_prefix(arc):
+    """prefix[i] = how many of the arc's first i steps are above obstacle height"""
+    prefix = array('l', [0])
+    for y in arc:
+        prefix.append(prefix[-1] + (y + PLAYER_SIZE <= OBSTACLE_Y))
+    prefix.append(prefix[-1])  # Landing step, back on the ground
+    return prefix
+
+
+def clear_span(prefix):
+    """(first, last) step of the longest run above obstacle height, or None"""
+    best = None
+    start = None
+    for i in range(1, len(prefix)):
+        if prefix[i] > prefix[i - 1]:
+            if start is None:
+                start = i - 1
+            if best is None or i - 1 - start > best[1] - best[0]:
+                best = (start, i - 1)
+        else:
+            start = None
+    return best
+
+
+class Autopilot:
+    """A controller for run_headless() and the game loop: call it before each step, True means press SPACE"""
+
+    def __init__(self, tuning=None):
+        tuning = dict(TUNING, **(tuning or {}))
+        single = jump_arc(tuning)
+        # arcs[0] is the single jump, arcs[k] double-jumps on the k-th step after take-off.
+        # Half a frame of slack keeps the last double clear of the window edge.
+        arcs = [single]
+        k = 1
+        while k <= len(single) and k * FRAME_MS < tuning['double_jump_window'] - FRAME_MS / 2:
+            arcs.append(jump_arc(tuning, k))
+            k += 1
+        self.arcs = arcs
+        self.prefix = [clear_prefix(arc) for arc in arcs]
+        self.spans = [clear_span(prefix) for prefix in self.prefix]
+        self.airtime = [len(arc) + 1 for arc in arcs]
+        # Plans worth trying for an obstacle, the single jump first then the longest clears
+        doubles = sorted((k for k in range(1, len(arcs)) if self.spans[k]),
+                         key=lambda k: self.spans[k][0] - self.spans[k][1])
+        self.plans = ([0] if self.spans[0] else []) + doubles
+        self.steps = {}  # game speed -> whole pixels a rect actually moves per step
+        self.probe = pygame.Rect(0, 0, 0, 0)
+        self.reset()
+
+    def reset(self):
+        self.plan = None  # Arc being flown, None on the ground or in a jump we didn't start
+        self.takeoff = 0  # Frame of the take-off press
+        self.doubled = False
+        self.frame = -1
+
+    def step_for(self, speed):
+        """Rect.x -= speed rounds to whole pixels, so work out the real per-step move once per speed"""
+        step = self.steps.get(speed)
+        if step is None:
+            self.probe.x = 10000
+            self.probe.x -= speed
+            step = max(1, 10000 - self.probe.x)
+            self.steps[speed] = step
+        return step
+
+    def clears(self, plan, offset, t0, t1):
+        """Is arc plan above obstacle height on every step from offset + t0 to offset + t1?"""
+        if t0 >= NEVER:
+            return True
+        prefix = self.prefix[plan]
+        a = offset + t0
+        b = offset + t1 + 1
+        if b >= len(prefix):
+            return False  # Back on the ground before the obstacle has passed
+        return prefix[b] - prefix[a] == b - a
+
+    def __call__(self, game):
+        if game.finished:
+            return False
+        if game.frame < self.frame:
+            self.reset()  # The game was restarted
+        self.frame = game.frame
+        step = self.step_for(game.game_speed)
+        player_left = game.player_x
+        player_right = game.player_x + PLAYER_SIZE
+
+        # The next two obstacles as windows of upcoming steps where they overlap the player in x
+        a0 = a1 = b0 = b1 = NEVER
+        for rect in game.obstacles.rects:
+            t1 = -((player_left - rect.right) // step) - 2
+            if t1 < 0:
+                continue  # Already past
+            t0 = (rect.x - player_right) // step
+            if t0 < 0:
+                t0 = 0
+            if t0 < a0:
+                a0, a1, b0, b1 = t0, t1, a0, a1
+            elif t0 < b0:
+                b0, b1 = t0, t1
+
+        if game.is_jumping:
+            return self.in_air(game, a0, a1, b0, b1)
+        self.plan = None
+        self.doubled = False
+        if a0 < NEVER and self.jump_now(game, a0, a1, b0, b1):
+            return True
+        return self.item_jump(game, step, a0, a1)
+
+    def jump_now(self, game, a0, a1, b0, b1):
+        """On the ground: is this the step to take off for the next obstacle?"""
+        needed = a1 - a0
+        plan = None
+        for candidate in self.plans:
+            first, last = self.spans[candidate]
+            if last - first >= needed:
+                plan = candidate
+                break
+        if plan is None:
+            if not self.plans:
+                return False
+            plan = self.plans[-1]  # Nothing clears it, take the longest and hope
+        first, last = self.spans[plan]
+        # Centre the clear part of the arc on the obstacle; later steps only lose margin
+        if a0 - first > last - a1:
+            return False
+        if not self.clears(plan, 0, b0, b1) and b0 < self.airtime[plan]:
+            # The one after lands mid-jump, prefer a plan that clears both
+            for candidate in self.plans:
+                if self.clears(candidate, 0, a0, a1) and self.clears(candidate, 0, b0, b1):
+                    plan = candidate
+                    break
+        self.plan = plan
+        self.takeoff = game.frame
+        return True
+
+    def in_air(self, game, a0, a1, b0, b1):
+        plan = self.plan
+        if plan is None or self.doubled:
+            return False
+        since = game.frame - self.takeoff
+        if plan and since == plan:
+            self.doubled = True  # The double jump this plan was built around
+            return True
+        if plan == 0 and since < len(self.arcs) and game.can_double_jump:
+            # Reactive double jump when the single arc is going to hit something
+            if not (self.clears(0, since, a0, a1) and self.clears(0, since, b0, b1)):
+                if self.clears(since, since, a0, a1):
+                    self.plan = since
+                    self.doubled = True
+                    return True
+        return False
+
+    def item_jump(self, game, step, a0, a1):
+        """Jump for an item above head height when it can't spoil the next obstacle's jump"""
+        if not self.spans[0]:
+            return False
+        airtime = self.airtime[0]
+        if a0 < NEVER:
+            first, last = self.spans[0]
+            if (a0 - first) - (last - a1) < 2 * (airtime + 1):
+                return False  # The obstacle jump would be due before landing
+        arc = self.arcs[0]
+        player_left = game.player_x
+        player_right = game.player_x + PLAYER_SIZE
+        for rect in game.items.rects:
+            if rect.bottom > game.player_y:
+                continue  # Collected from the ground anyway
+            t1 = -((player_left - rect.right) // step) - 2
+            t0 = (rect.x - player_right) // step
+            if t0 < 0 or t0 >= airtime:
+                continue
+            for t in range(t0, min(t1, len(arc) - 1) + 1):
+                if arc[t] < rect.bottom and arc[t] + PLAYER_SIZE > rect.y:
+                    self.plan = 0
+                    self.takeoff = game.frame
+                    return True
+        return False
+
+
+def play(seeds, tuning=None, max_steps=20000):
+    """Run the autopilot over seeds headless, returns (wins, decisions, seconds)"""
+    from engine import GameState
+
+    wins = decisions = 0
+    bot = Autopilot(tuning)
+    elapsed = 0.0
+    for seed in seeds:
+        game = GameState(seed, tuning)
+        bot.reset()
+        steps = 0
+        while not game.finished and steps < max_steps:
+            start = time.perf_counter()
+            press = bot(game)
+            elapsed += time.perf_counter() - start
+            game.step(press)
+            steps += 1
+        decisions += steps
+        wins += game.game_won
+    return wins, decisions, elapsed
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    wins, decisions, elapsed = play(range(runs))
+    print(f"autopilot won {wins}/{runs} runs, {decisions / elapsed:,.0f} decisions/s "
+          f"({elapsed / decisions * 1e6:.1f} us each)")
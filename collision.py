@@ -0,0 +1,129 @@
+"""
+Shinchan Jungle Run - Collision Detection
+Batched hit tests over a pool's Rect column. A single query goes
+straight to Rect.collidelistall (one C call for every entity); many
+queries against a crowded field share an x-sorted sweep broad-phase so
+each one only narrow-phase tests the entities in its x window.
+
+The game itself only ever makes one query per pool per step (the
+player), so it always takes the collidelistall path. find_hits_many
+and SweepIndex are for callers with many query rects, such as a
+multi-player field, and are otherwise only used by the benchmark.
+
+Run this file directly for a micro-benchmark against the old
+one-colliderect-per-entity loop.
+"""
+
+import random
+import time
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+import pygame
+
+# Rebuilding the sorted index costs about as much as 25-30 full
+# collidelistall scans, so the sweep needs both many queries and a
+# crowded field. Measured with benchmark(): at 16 queries plain
+# collidelistall wins even at 10000 entities, from 48 queries and 1000
+# entities up the sweep is clearly ahead.
+BROAD_PHASE_MIN = 1000
+SWEEP_MIN_QUERIES = 48
+
+_left = attrgetter('left')
+_width = attrgetter('width')
+
+
+def find_hits(rect, rects):
+    """Indices of every rect in rects that overlaps rect, from one batched call"""
+    return rect.collidelistall(rects)
+
+
+class SweepIndex:
+    """Rects sorted by left edge, so a query only narrow-phases the x window it overlaps"""
+
+    def __init__(self):
+        self.order = []  # order[k] is the index in the original list of the k-th rect by x
+        self.lefts = []
+        self.sorted_rects = []
+        self.max_width = 0
+
+    def rebuild(self, rects):
+        lefts = list(map(_left, rects))
+        order = sorted(range(len(rects)), key=lefts.__getitem__)
+        self.order = order
+        self.lefts = list(map(lefts.__getitem__, order))
+        self.sorted_rects = list(map(rects.__getitem__, order))
+        self.max_width = max(map(_width, rects), default=0)
+
+    def query(self, rect):
+        """Indices of rects overlapping rect (broad-phase then narrow-phase)"""
+        lo = bisect_right(self.lefts, rect.left - self.max_width)
+        hi = bisect_left(self.lefts, rect.right, lo)
+        if lo >= hi:
+            return []
+        order = self.order
+        return [order[lo + k] for k in rect.collidelistall(self.sorted_rects[lo:hi])]
+
+
+def find_hits_many(query_rects, rects, index=None):
+    """Hits for several query rects at once, returns one list of indices per query"""
+    if len(rects) < BROAD_PHASE_MIN or len(query_rects) < SWEEP_MIN_QUERIES:
+        return [query.collidelistall(rects) for query in query_rects]
+    if index is None:
+        index = SweepIndex()
+    index.rebuild(rects)
+    return [index.query(query) for query in query_rects]
+
+
+def _per_entity_loop(player_rect, rects):
+    # The original approach: one colliderect call per entity
+    hits = []
+    for index, rect in enumerate(rects):
+        if player_rect.colliderect(rect):
+            hits.append(index)
+    return hits
+
+
+def _sweep(query_rects, rects, index):
+    index.rebuild(rects)
+    return [index.query(query) for query in query_rects]
+
+
+def _random_field(count, width):
+    rng = random.Random(count)
+    return [pygame.Rect(rng.randrange(width), rng.randrange(200, 320), 40, 40) for _ in range(count)]
+
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def benchmark(counts=(5, 100, 1000, 10000), queries=1, repeat=100):
+    """Compare per-entity colliderect against the batched and sweep paths (microseconds per frame)"""
+    results = []
+    for count in counts:
+        width = max(800, count * 20)  # Keep density roughly constant as the field grows
+        rects = _random_field(count, width)
+        players = [pygame.Rect(100 + lane * width // queries, 260, 60, 60) for lane in range(queries)]
+        index = SweepIndex()
+        expected = [_per_entity_loop(p, rects) for p in players]
+        assert [sorted(hits) for hits in _sweep(players, rects, index)] == expected
+        assert [find_hits(p, rects) for p in players] == expected
+        results.append({
+            'entities': count,
+            'queries': queries,
+            'per_entity_us': _time(lambda: [_per_entity_loop(p, rects) for p in players], repeat),
+            'batched_us': _time(lambda: [find_hits(p, rects) for p in players], repeat),
+            'sweep_us': _time(lambda: _sweep(players, rects, index), repeat),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'queries':>7} {'entities':>8} {'per-entity':>12} {'batched':>10} {'sweep':>10}   (us/frame)")
+    for queries in (1, 16, SWEEP_MIN_QUERIES):
+        for row in benchmark(queries=queries):
+            print(f"{row['queries']:>7} {row['entities']:>8} {row['per_entity_us']:>12.1f} "
+                  f"{row['batched_us']:>10.1f} {row['sweep_us']:>10.1f}")
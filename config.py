@@ -0,0 +1,157 @@
+"""
+Shinchan Jungle Run - Game Config
+Tuning values can live in a TOML or JSON file instead of the code. A
+file is parsed and checked once into a frozen GameConfig, whose values
+GameState copies onto its own attributes, so the simulation never looks
+anything up in a dict or touches the file. A ConfigWatcher polls the
+file on a background thread during tuning sessions and swaps in a new
+GameConfig whenever it is saved; the game only compares references and
+picks the new one up between runs.
+
+Example config.toml (any value left out keeps its default):
+    gravity = 1.2
+    jump_force = -20
+    obstacle_spawn_interval = 75
+"""
+
+import json
+import os
+import threading
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+from settings import TUNING
+
+POLL_INTERVAL = 0.5  # Seconds between checks of the config file
+
+# What each tuning value has to satisfy for the simulation and level generator to work
+CHECKS = {
+    'start_speed': (lambda value: value > 0, "greater than 0"),
+    'gravity': (lambda value: value > 0, "greater than 0"),
+    'jump_force': (lambda value: value < 0, "negative (upwards)"),
+    'double_jump_force': (lambda value: value < 0, "negative (upwards)"),
+    'double_jump_window': (lambda value: value >= 0, "0 or more"),
+    'item_spawn_interval': (lambda value: value > 0, "greater than 0"),
+    'obstacle_spawn_interval': (lambda value: value > 0, "greater than 0"),
+    'speed_step': (lambda value: value >= 0, "0 or more"),
+    'speed_interval': (lambda value: value > 0, "greater than 0"),
+    'parents_distance': (lambda value: value >= 0, "0 or more"),
+    'goal_distance': (lambda value: value > 0, "greater than 0"),
+}
+
+
+class ConfigError(Exception):
+    pass
+
+
+class GameConfig:
+    """Frozen set of tuning values, every name in TUNING as a plain attribute"""
+
+    __slots__ = tuple(TUNING)
+
+    def __init__(self, values=None):
+        values = dict(values or {})
+        unknown = set(values) - set(TUNING)
+        if unknown:
+            raise ValueError(f"Unknown tuning values: {', '.join(sorted(unknown))}")
+        for name, default in TUNING.items():
+            value = values.get(name, default)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{name} must be a number, not {value!r}")
+            check, requirement = CHECKS[name]
+            if not check(value):
+                raise ValueError(f"{name} must be {requirement}, not {value!r}")
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GameConfig is frozen, load a new one instead")
+
+    def __delattr__(self, name):
+        raise AttributeError("GameConfig is frozen, load a new one instead")
+
+    def __reduce__(self):
+        return GameConfig, (self.as_dict(),)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in TUNING}
+
+    def changes(self):
+        """Values that differ from the defaults"""
+        return {name: value for name, value in self.as_dict().items() if value != TUNING[name]}
+
+    def __eq__(self, other):
+        if not isinstance(other, GameConfig):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        return hash(tuple(self.as_dict().values()))
+
+    def __repr__(self):
+        changes = ', '.join(f"{name}={value!r}" for name, value in self.changes().items())
+        return f"GameConfig({changes})"
+
+
+def load_config(path):
+    """Parse a .toml or .json file of tuning values into a GameConfig"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        raise ConfigError(f"{path}: {e.strerror}")
+    try:
+        if path.endswith('.json'):
+            values = json.loads(data)
+        elif tomllib is None:
+            raise ConfigError(f"{path}: TOML configs need Python 3.11+, use a .json file")
+        else:
+            values = tomllib.loads(data.decode('utf-8'))
+        if not isinstance(values, dict):
+            raise ConfigError(f"{path}: expected a table of tuning values")
+        return GameConfig(values)
+    except ConfigError:
+        raise
+    except (ValueError, UnicodeDecodeError) as e:  # Includes JSON and TOML syntax errors
+        raise ConfigError(f"{path}: {e}")
+
+
+class ConfigWatcher:
+    """Reloads a config file on a daemon thread whenever it changes on disk"""
+
+    def __init__(self, path, interval=POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.config = load_config(path)  # Swapped whole, so readers never see half a reload
+        self.stamp = self._stamp()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._watch, name='config-watcher', daemon=True)
+        self.thread.start()
+
+    def _stamp(self):
+        try:
+            info = os.stat(self.path)
+        except OSError:
+            return None
+        return info.st_mtime_ns, info.st_size
+
+    def _watch(self):
+        while not self.stopped.wait(self.interval):
+            stamp = self._stamp()
+            if stamp == self.stamp or stamp is None:
+                continue
+            self.stamp = stamp
+            # Parsing and checking happen here, the game loop only swaps a reference later
+            try:
+                config = load_config(self.path)
+            except ConfigError as e:
+                print(f"Config not reloaded: {e}")  # The previous config stays in use
+                continue
+            if config != self.config:
+                self.config = config
+
+    def close(self, timeout=2):
+        self.stopped.set()
+        self.thread.join(timeout)
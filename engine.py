@@ -0,0 +1,270 @@
+"""
+Shinchan Jungle Run - Simulation Engine
+Headless game logic shared by the interactive game and batch runs.
+Nothing in here draws, plays sounds or waits on a clock.
+"""
+
+import os
+import random
+import pygame
+from entities import EntityPool
+from collision import find_hits
+from levels import LevelGenerator, LevelCursor
+from config import GameConfig
+
+from settings import (WIDTH, FRAME_MS, GROUND_Y, PLAYER_X, PLAYER_SIZE,
+                      ITEM_SIZE, OBSTACLE_Y, OBSTACLE_SIZE)
+
+# Events reported by GameState.jump() and GameState.update()
+JUMP = 'jump'
+DOUBLE_JUMP = 'double_jump'
+COLLECT = 'collect'
+CRASH = 'crash'
+WIN = 'win'
+
+
+def use_dummy_drivers():
+    """Point SDL at the dummy video/audio drivers so no window or device is opened"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+def new_seed():
+    """Pick a fresh session seed (recorded so the run can be replayed)"""
+    return random.randrange(2 ** 63)
+
+
+def recycle_offscreen(pool):
+    """Recycle entities that scrolled off the left edge (backwards, so swap-removal never skips one)"""
+    rects = pool.rects
+    for i in range(len(rects) - 1, -1, -1):
+        if rects[i].right < 0:
+            pool.kill(i)
+
+
+class GameState:
+    def __init__(self, seed=None, tuning=None, background_levels=False):
+        self.configure(tuning)
+        self.background_levels = background_levels  # Generate level segments on a look-ahead thread
+        self.level = None
+        self.reset(seed)
+
+    def configure(self, tuning):
+        """Use a GameConfig (or a dict of tuning overrides) from the next reset() on"""
+        self.config = tuning if isinstance(tuning, GameConfig) else GameConfig(tuning)
+        self.tuning = self.config.as_dict()
+
+    def reset(self, seed=None):
+        self.seed = new_seed() if seed is None else seed
+        if self.level is not None:
+            self.level.close()
+        # The generator owns the per-session RNG, never the global one
+        self.level = LevelCursor(LevelGenerator(self.seed, self.tuning), self.background_levels)
+        self.player_x = PLAYER_X
+        self.player_y = GROUND_Y
+        self.player_velocity = 0
+        # Copied onto the instance so the hot loop reads plain attributes
+        for name, value in self.tuning.items():
+            setattr(self, name, value)
+        self.is_jumping = False
+        self.jump_count = 0  # Track jumps for double jump
+        self.can_double_jump = False  # Can perform double jump
+        self.jumps = 0  # Jumps and double jumps made this run
+        self.double_jumps = 0
+        self.score = 0
+        self.choco_count = 0
+        self.pudding_count = 0
+        self.distance = 0
+        self.game_speed = self.start_speed
+        self.game_over = False
+        self.game_won = False
+        self.items = EntityPool()  # Collectible items
+        self.obstacles = EntityPool()  # Obstacles to avoid
+        self.parents_x = WIDTH + self.goal_distance  # Parents at the end
+        self.parents_spawned = False
+        self.bg_x = 0  # Background scroll position
+        self.last_jump_time = 0  # For double jump timing
+        self.frame = 0  # Fixed steps simulated so far
+        self.time_ms = 0  # Simulated clock, advances FRAME_MS per step
+        self.player_rect = pygame.Rect(self.player_x, self.player_y, PLAYER_SIZE, PLAYER_SIZE)
+        self.parents_rect = pygame.Rect(self.parents_x, 220, 80, 160)
+        # State before the latest step, so a renderer can interpolate between steps
+        self.prev_player_y = self.player_y
+        self.prev_distance = self.distance
+
+    def close(self):
+        """Stop the level look-ahead thread"""
+        self.level.close()
+
+    @property
+    def finished(self):
+        return self.game_over or self.game_won
+
+    def jump(self):
+        """Handle a SPACE press, returns the event it caused (or None)"""
+        if self.finished:
+            return None
+
+        current_time = self.time_ms
+        event = None
+
+        # First jump (on ground)
+        if not self.is_jumping:
+            self.player_velocity = self.jump_force
+            self.is_jumping = True
+            self.jump_count = 1
+            self.can_double_jump = True
+            self.jumps += 1
+            event = JUMP
+
+        # Double jump (in air, within time window)
+        elif self.can_double_jump and self.jump_count < 2:
+            if current_time - self.last_jump_time < self.double_jump_window:
+                self.player_velocity = self.double_jump_force
+                self.jump_count = 2
+                self.can_double_jump = False  # Can't triple jump
+                self.double_jumps += 1
+                event = DOUBLE_JUMP
+            else:
+                # Too late for double jump
+                self.can_double_jump = False
+
+        self.last_jump_time = current_time
+        return event
+
+    def update(self, lap=None):
+        """Advance the simulation by one fixed step, returns the list of events.
+
+        lap(phase) is called after each phase when profiling.
+        """
+        events = []
+        if self.finished:
+            return events
+
+        self.prev_player_y = self.player_y
+        self.prev_distance = self.distance
+        self.update_physics()
+        if lap:
+            lap('physics')
+        self.update_spawning()
+        if lap:
+            lap('spawning')
+        self.update_items(events)
+        if lap:
+            lap('items')
+        self.update_obstacles(events)
+        self.update_parents(events)
+        if lap:
+            lap('obstacles')
+
+        self.frame += 1
+        self.time_ms += FRAME_MS
+        return events
+
+    def update_physics(self):
+        # Apply gravity
+        self.player_velocity += self.gravity
+        self.player_y += self.player_velocity
+
+        # Ground collision
+        if self.player_y >= GROUND_Y:
+            self.player_y = GROUND_Y
+            self.player_velocity = 0
+            self.is_jumping = False
+            self.jump_count = 0
+            self.can_double_jump = False
+        self.player_rect.topleft = (self.player_x, self.player_y)
+
+        # Update distance and speed
+        self.distance += self.game_speed
+        if self.distance % self.speed_interval == 0:  # Increase speed every speed_interval units
+            self.game_speed += self.speed_step
+
+        # Scroll background
+        self.bg_x -= self.game_speed
+        if self.bg_x <= -WIDTH:
+            self.bg_x = 0
+
+    def update_spawning(self):
+        # Spawn whatever the precomputed schedule has due on this frame
+        level = self.level
+        frame = self.frame
+        if frame >= level.end:
+            level.advance()
+        while level.next_item_frame == frame:
+            item_type, item_y = level.pop_item()
+            self.items.spawn(item_type, WIDTH, item_y, ITEM_SIZE, ITEM_SIZE)
+        while level.next_obstacle_frame == frame:
+            level.pop_obstacle()
+            self.obstacles.spawn('obstacle', WIDTH, OBSTACLE_Y, OBSTACLE_SIZE, OBSTACLE_SIZE)
+
+    def update_items(self, events):
+        # Move items, then collect everything the player touches in one batched test
+        speed = self.game_speed
+        items = self.items
+        rects = items.rects
+        for rect in rects:
+            rect.x -= speed
+        # Hits come back in ascending order, kill from the end so swaps never move an unvisited hit
+        for i in reversed(find_hits(self.player_rect, rects)):
+            events.append(COLLECT)
+            self.score += 1
+            if items[i].kind == 'choco':
+                self.choco_count += 1
+            else:
+                self.pudding_count += 1
+                self.score += 2  # Extra points for pudding
+            items.kill(i)
+        recycle_offscreen(items)
+
+    def update_obstacles(self, events):
+        # Move obstacles and check collision
+        speed = self.game_speed
+        rects = self.obstacles.rects
+        for rect in rects:
+            rect.x -= speed
+        for i in find_hits(self.player_rect, rects):
+            self.game_over = True
+            events.append(CRASH)
+        recycle_offscreen(self.obstacles)
+
+    def update_parents(self, events):
+        # Check if parents should appear
+        if self.distance >= self.parents_distance and not self.parents_spawned:
+            self.parents_spawned = True
+
+        # Update parents position
+        if self.parents_spawned:
+            self.parents_x -= self.game_speed
+
+            # Check if reached parents
+            parents_rect = self.parents_rect
+            parents_rect.x = int(self.parents_x)  # Truncate like the Rect constructor, not round
+            if self.player_rect.colliderect(parents_rect):
+                self.game_won = True
+                events.append(WIN)
+
+    def step(self, jump=False):
+        """Process an optional SPACE press then advance one step"""
+        events = []
+        if jump:
+            event = self.jump()
+            if event:
+                events.append(event)
+        events.extend(self.update())
+        return events
+
+
+def run_headless(game=None, controller=None, max_steps=100000, seed=None, tuning=None):
+    """Step a game to completion as fast as possible, no display or sound needed.
+
+    controller(game) is called before every step and returns True to press SPACE.
+    """
+    if game is None:
+        game = GameState(seed, tuning)
+    steps = 0
+    while not game.finished and steps < max_steps:
+        jump = controller(game) if controller else False
+        game.step(jump)
+        steps += 1
+    return game
@@ -0,0 +1,67 @@
+"""
+Shinchan Jungle Run - Entity Pools
+Items and obstacles are stored as __slots__ records in a dense list.
+Removing one swaps the last record into its place (O(1)) and the dead
+record is kept for the next spawn, so spawning reuses records instead
+of building new ones. A parallel list of the live Rects is kept for
+batched collision tests; each test still returns a small new list of
+hit indices, the only per-step allocation left in the pools.
+"""
+
+import pygame
+
+
+class Entity:
+    __slots__ = ('kind', 'rect', 'serial')
+
+    def __init__(self):
+        self.kind = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.serial = 0  # Unique per spawn, survives record reuse (network snapshots key on it)
+
+
+class EntityPool:
+    __slots__ = ('live', 'rects', 'free', 'spawned')
+
+    def __init__(self):
+        self.live = []  # Active entities, order not preserved
+        self.rects = []  # rects[i] is live[i].rect
+        self.free = []  # Recycled records waiting to be reused
+        self.spawned = 0  # Spawns so far, the next serial
+
+    def spawn(self, kind, x, y, width, height):
+        """Activate an entity, reusing a dead record when one is available"""
+        entity = self.free.pop() if self.free else Entity()
+        entity.kind = kind
+        entity.rect.update(x, y, width, height)
+        self.spawned += 1
+        entity.serial = self.spawned
+        self.live.append(entity)
+        self.rects.append(entity.rect)
+        return entity
+
+    def kill(self, index):
+        """Swap-remove the entity at index and recycle it"""
+        live = self.live
+        entity = live[index]
+        last = live.pop()
+        last_rect = self.rects.pop()
+        if last is not entity:
+            live[index] = last
+            self.rects[index] = last_rect
+        self.free.append(entity)
+
+    def clear(self):
+        """Recycle every live entity"""
+        self.free.extend(self.live)
+        self.live.clear()
+        self.rects.clear()
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def __len__(self):
+        return len(self.live)
+
+    def __getitem__(self, index):
+        return self.live[index]
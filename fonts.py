@@ -0,0 +1,82 @@
+"""
+Shinchan Jungle Run - Font and Text Cache
+SysFont lookups and text rendering are slow, so fonts are created once
+per size and rendered strings are kept in a small LRU cache. The first
+SysFont lookup scans every installed font, so the file it resolves to
+is remembered in the asset cache for the next launch.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+import pygame
+from asset_cache import CACHE_DIR
+
+FONT_NAME = 'Arial'
+TEXT_CACHE_SIZE = 256  # Rendered surfaces kept before the oldest is evicted
+FONT_PATHS = os.path.join(CACHE_DIR, 'fonts.json')
+
+_fonts = {}
+_font_path = []  # [path or None] once resolved this session
+_text_cache = OrderedDict()
+_lock = threading.Lock()  # Placeholders can be rendered from the asset loader thread
+cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def font_path():
+    """File that FONT_NAME resolves to (None for pygame's default font), without a font scan when cached"""
+    if _font_path:
+        return _font_path[0]
+    try:
+        with open(FONT_PATHS) as f:
+            paths = json.load(f)
+    except (OSError, ValueError):
+        paths = {}
+    path = paths.get(FONT_NAME, '')
+    if path == '' or (path is not None and not os.path.exists(path)):
+        path = pygame.font.match_font(FONT_NAME)  # The slow scan
+        paths[FONT_NAME] = path
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(FONT_PATHS, 'w') as f:
+                json.dump(paths, f)
+        except OSError:
+            pass
+    _font_path.append(path)
+    return path
+
+
+def get_font(size):
+    """Return the shared font for a point size, creating it on first use"""
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(font_path(), size)  # What SysFont(FONT_NAME, size) opens
+        _fonts[size] = font
+    return font
+
+
+def render_text(text, size, color):
+    """Return a rendered text surface, reusing it while (text, size, color) is unchanged"""
+    key = (text, size, tuple(color))
+    with _lock:
+        surface = _text_cache.get(key)
+        if surface is not None:
+            _text_cache.move_to_end(key)
+            cache_stats['hits'] += 1
+            return surface
+
+        cache_stats['misses'] += 1
+        surface = get_font(size).render(text, True, color)
+        _text_cache[key] = surface
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+            cache_stats['evictions'] += 1
+        return surface
+
+
+def clear_cache():
+    """Drop all fonts and rendered text (call before pygame.font.quit())"""
+    with _lock:
+        _fonts.clear()
+        _text_cache.clear()
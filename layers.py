@@ -0,0 +1,97 @@
+"""
+Shinchan Jungle Run - Static UI Layers
+Overlays and button states are rendered once and reused. When a run
+ends, the frozen scene, overlay and titles are flattened into a single
+base layer, so an idle end screen only blits a button when its hover
+state flips.
+"""
+
+import pygame
+from fonts import render_text
+
+BUTTON_FONT_SIZE = 30
+BUTTON_RADIUS = 12
+BUTTON_BORDER = (50, 50, 50)
+
+_overlays = {}
+_buttons = {}
+
+
+def overlay_surface(size, color):
+    """Full-screen translucent fill, built once per (size, color)"""
+    key = (tuple(size), tuple(color))
+    surface = _overlays.get(key)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill(color)
+        _overlays[key] = surface
+    return surface
+
+
+def button_surface(text, size, color, text_color):
+    """A rounded button with border and centred label, built once per look"""
+    key = (text, tuple(size), tuple(color), tuple(text_color))
+    surface = _buttons.get(key)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, color, rect, border_radius=BUTTON_RADIUS)
+        pygame.draw.rect(surface, BUTTON_BORDER, rect, 2, border_radius=BUTTON_RADIUS)
+        label = render_text(text, BUTTON_FONT_SIZE, text_color)
+        surface.blit(label, label.get_rect(center=rect.center))
+        _buttons[key] = surface
+    return surface
+
+
+def clear_layers():
+    _overlays.clear()
+    _buttons.clear()
+
+
+class Button:
+    def __init__(self, text, rect, inactive_color, active_color, text_color=(255, 255, 255)):
+        self.text = text
+        self.rect = pygame.Rect(rect)
+        self.inactive_color = inactive_color
+        self.active_color = active_color
+        self.text_color = text_color
+
+    def surface(self, hovered):
+        color = self.active_color if hovered else self.inactive_color
+        return button_surface(self.text, self.rect.size, color, self.text_color)
+
+
+class EndScreen:
+    def __init__(self, base, buttons):
+        self.base = base  # Frozen scene + overlay + titles
+        self.buttons = buttons
+        self.hovered = None  # Hover state last drawn, None means redraw everything
+
+    def invalidate(self):
+        self.hovered = None
+
+    def draw(self, screen, mouse_pos, tracker=None):
+        """Blit only the layers that changed, returns True if anything was drawn"""
+        hovered = tuple(button.rect.collidepoint(mouse_pos) for button in self.buttons)
+        if self.hovered is None:
+            screen.blit(self.base, (0, 0))
+            changed = range(len(self.buttons))
+        else:
+            changed = [i for i, state in enumerate(hovered) if state != self.hovered[i]]
+        for i in changed:
+            button = self.buttons[i]
+            screen.blit(button.surface(hovered[i]), button.rect)
+        self.hovered = hovered
+
+        if tracker is not None:
+            tracker.add('end_screen', self.base.get_rect(), id(self.base))
+            for button, state in zip(self.buttons, hovered):
+                tracker.add(('button', button.rect.topleft), button.rect, state)
+        return bool(changed)
+
+    def button_at(self, pos):
+        """Index of the button under pos, or None"""
+        for i, button in enumerate(self.buttons):
+            if button.rect.collidepoint(pos):
+                return i
+        return None
@@ -0,0 +1,219 @@
+"""
+Shinchan Jungle Run - Level Generator
+Spawn schedules are worked out ahead of time, one segment of frames at
+a time, as compact arrays. Every obstacle is checked against the jump
+physics before it is scheduled, and one that couldn't be cleared is
+held back until it can. The game reads the schedule through a cursor,
+so the per-frame path has no random calls and almost no branching.
+
+With the default tuning the schedule is frame-for-frame what the old
+spawn timers produced, so seeds and recordings stay valid.
+"""
+
+import math
+import queue
+import random
+import threading
+from array import array
+from settings import (FRAME_MS, GROUND_Y, PLAYER_SIZE, TUNING,
+                      ITEM_Y_RANGE, OBSTACLE_Y, OBSTACLE_SIZE)
+
+SEGMENT_FRAMES = 600  # 10 seconds of play per segment
+LOOKAHEAD = 3  # Segments the background thread keeps ready
+
+ITEM_KINDS = ['choco', 'pudding']
+
+
+def jump_arc(tuning, double_at=None):
+    """Player y for each frame after a jump from the ground until it lands.
+
+    double_at is the frame (after take-off) the second SPACE lands on, if any.
+    """
+    gravity = tuning['gravity']
+    velocity = tuning['jump_force']
+    y = GROUND_Y
+    ys = []
+    frame = 0
+    while True:
+        if frame == double_at:
+            velocity = tuning['double_jump_force']
+        velocity += gravity
+        y += velocity
+        if y >= GROUND_Y or frame > 1000:
+            return ys
+        ys.append(y)
+        frame += 1
+
+
+def clear_span(arc):
+    """Longest run of frames where the player is fully above an obstacle"""
+    best = run = 0
+    for y in arc:
+        if y + PLAYER_SIZE <= OBSTACLE_Y:
+            run += 1
+            best = max(best, run)
+        else:
+            run = 0
+    return best
+
+
+class JumpLimits:
+    """What the jump physics can clear, from the single jump and every double-jump timing"""
+
+    def __init__(self, tuning):
+        single = jump_arc(tuning)
+        self.airtime = len(single) + 1  # Frames from take-off to landing
+        window_frames = math.ceil(tuning['double_jump_window'] / FRAME_MS)
+        arcs = [single] + [jump_arc(tuning, k) for k in range(1, min(window_frames, len(single) + 1))]
+        self.clear_frames = max(clear_span(arc) for arc in arcs)
+
+    def can_clear(self, speed):
+        """Can a jump stay above an obstacle for as long as it overlaps the player at speed?"""
+        overlap = math.ceil((OBSTACLE_SIZE + PLAYER_SIZE) / speed) + 1
+        return overlap <= self.clear_frames
+
+
+class Segment:
+    __slots__ = ('start', 'end', 'item_frames', 'item_kinds', 'item_ys', 'obstacle_frames', 'held_back')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end  # First frame of the next segment
+        self.item_frames = array('l')
+        self.item_kinds = array('b')  # Index into ITEM_KINDS
+        self.item_ys = array('h')
+        self.obstacle_frames = array('l')
+        self.held_back = 0  # Frames obstacles were delayed to stay clearable
+
+
+class LevelGenerator:
+    """Produces segments in order; owns the run's RNG"""
+
+    def __init__(self, seed, tuning=None):
+        self.tuning = dict(TUNING, **(tuning or {}))
+        self.rng = random.Random(seed)
+        self.limits = JumpLimits(self.tuning)
+        self.frame = 0
+        # Mirrors of the engine's speed/distance so spawns know how fast they'll move
+        self.distance = 0
+        self.speed = self.tuning['start_speed']
+        self.item_timer = 0
+        self.obstacle_timer = 0
+        self.last_obstacle = None  # Frame the previous obstacle spawned
+
+    def next_segment(self, frames=SEGMENT_FRAMES):
+        tuning = self.tuning
+        item_interval = tuning['item_spawn_interval']
+        obstacle_interval = tuning['obstacle_spawn_interval']
+        speed_step = tuning['speed_step']
+        speed_interval = tuning['speed_interval']
+        low, high = ITEM_Y_RANGE
+        rng = self.rng
+        limits = self.limits
+
+        segment = Segment(self.frame, self.frame + frames)
+        for frame in range(segment.start, segment.end):
+            # Same order as GameState.update(): physics first, then spawning
+            self.distance += self.speed
+            if self.distance % speed_interval == 0:
+                self.speed += speed_step
+
+            self.item_timer += 1
+            if self.item_timer > item_interval:
+                segment.item_frames.append(frame)
+                segment.item_kinds.append(ITEM_KINDS.index(rng.choice(ITEM_KINDS)))
+                segment.item_ys.append(rng.randint(low, high))
+                self.item_timer = 0
+
+            self.obstacle_timer += 1
+            if self.obstacle_timer > obstacle_interval:
+                # Hold the obstacle back while it's too slow to jump over, or
+                # the player would still be in the air from the previous one
+                too_close = (self.last_obstacle is not None
+                             and frame - self.last_obstacle < limits.airtime)
+                if too_close or not limits.can_clear(self.speed):
+                    segment.held_back += 1
+                else:
+                    segment.obstacle_frames.append(frame)
+                    self.last_obstacle = frame
+                    self.obstacle_timer = 0
+
+        self.frame = segment.end
+        return segment
+
+
+class LevelCursor:
+    """The main loop's view of the schedule: what spawns on the current frame"""
+
+    def __init__(self, generator, background=False):
+        self.generator = generator
+        self.queue = None
+        self.stopping = None
+        self.error = None  # What stopped the look-ahead thread, raised again on every advance()
+        if background:
+            self.queue = queue.Queue(maxsize=LOOKAHEAD)
+            self.stopping = threading.Event()
+            self.thread = threading.Thread(target=self._produce, name='level-lookahead', daemon=True)
+            self.thread.start()
+        self.segment = None
+        self.end = 0
+        self.next_item_frame = -1
+        self.next_obstacle_frame = -1
+        self._item = 0
+        self._obstacle = 0
+        self.advance()
+
+    def _produce(self):
+        while not self.stopping.is_set():
+            try:
+                segment = self.generator.next_segment()
+            except Exception as e:
+                segment = e  # Handed to the main thread instead of leaving it waiting forever
+            while not self.stopping.is_set():
+                try:
+                    self.queue.put(segment, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if isinstance(segment, Exception):
+                return
+
+    def advance(self):
+        """Move on to the next segment (called when the frame reaches self.end)"""
+        if self.error is not None:
+            raise self.error
+        if self.queue is not None:
+            segment = self.queue.get()
+            if isinstance(segment, Exception):
+                self.error = segment
+                raise segment
+        else:
+            segment = self.generator.next_segment()
+        self.segment = segment
+        self.end = segment.end
+        self._item = 0
+        self._obstacle = 0
+        self.next_item_frame = segment.item_frames[0] if segment.item_frames else segment.end
+        self.next_obstacle_frame = segment.obstacle_frames[0] if segment.obstacle_frames else segment.end
+
+    def pop_item(self):
+        """(kind, y) of the item due on next_item_frame"""
+        segment = self.segment
+        i = self._item
+        kind = ITEM_KINDS[segment.item_kinds[i]]
+        y = segment.item_ys[i]
+        i += 1
+        self._item = i
+        self.next_item_frame = segment.item_frames[i] if i < len(segment.item_frames) else segment.end
+        return kind, y
+
+    def pop_obstacle(self):
+        segment = self.segment
+        i = self._obstacle + 1
+        self._obstacle = i
+        self.next_obstacle_frame = segment.obstacle_frames[i] if i < len(segment.obstacle_frames) else segment.end
+
+    def close(self):
+        """Stop the look-ahead thread"""
+        if self.stopping is not None:
+            self.stopping.set()
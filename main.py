@@ -5,19 +5,39 @@ Fan-made project - Not for commercial use
 All Shinchan characters belong to their respective copyright owners and ai features
 """
 
-import pygame
-import random
 import sys
+import time
+
+LAUNCHED = time.perf_counter()  # Origin of the startup report
+if __name__ == "__main__":
+    # pygame only asks pkg_resources for its bundled font and falls back to a plain
+    # file path without it, importing it costs more than the rest of startup together
+    sys.modules.setdefault('pkg_resources', None)
+
+import pygame
 import math
-import os
 import traceback
-from pygame import mixer
+import argparse
+from engine import GameState, JUMP, DOUBLE_JUMP, COLLECT, CRASH, WIN
+from settings import WIDTH, HEIGHT, FPS, FRAME_MS, MAX_CATCH_UP_STEPS
+from fonts import render_text, clear_cache
+from render import DirtyRects
+from asset_cache import load_image, cached_surface
+from layers import Button, EndScreen, button_surface, overlay_surface, clear_layers
+from parallax import ParallaxBackground, jungle_layers, single_layer
+from sprites import SpriteBatch
+from telemetry import DB_PATH, FrameHistogram, TelemetryStore, run_record
+from profiler import FrameProfiler
+from sounds import SoundManager
+from startup import StartupTimer, BackgroundLoader
+from config import ConfigError, ConfigWatcher
+from scaling import MODES as SCALING_MODES, ScaledDisplay, get_mouse_pos
 
 def safe_init():
-    """Safely initialize pygame with error handling"""
+    """Safely initialize the parts of pygame the home screen needs (the mixer opens on the sound loader)"""
     try:
-        pygame.init()
-        mixer.init()
+        pygame.display.init()
+        pygame.font.init()
         print("Pygame initialized successfully")
         return True
     except Exception as e:
@@ -26,76 +46,81 @@ def safe_init():
 
 def load_image_safe(path, default_size=(100, 100), default_color=(200, 150, 150), description=""):
     """Safely load image or create placeholder"""
+    def build_placeholder():
+        # Create a colored rectangle as placeholder
+        surface = pygame.Surface(default_size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, default_color, (0, 0, default_size[0], default_size[1]))
+        # Add text to identify the placeholder
+        if description:
+            text = render_text(description, 12, (255, 255, 255))
+            text_rect = text.get_rect(center=(default_size[0]//2, default_size[1]//2))
+            surface.blit(text, text_rect)
+        return surface
+
     try:
-        if os.path.exists(path):
-            image = pygame.image.load(path)
-            return pygame.transform.scale(image, default_size)
-        else:
-            # Create a colored rectangle as placeholder
-            surface = pygame.Surface(default_size, pygame.SRCALPHA)
-            pygame.draw.rect(surface, default_color, (0, 0, default_size[0], default_size[1]))
-            # Add text to identify the placeholder
-            if description:
-                font = pygame.font.SysFont('Arial', 12)
-                text = font.render(description, True, (255, 255, 255))
-                text_rect = text.get_rect(center=(default_size[0]//2, default_size[1]//2))
-                surface.blit(text, text_rect)
-            return surface
+        try:
+            return load_image(path, default_size)
+        except FileNotFoundError:
+            return cached_surface(('placeholder', default_size, default_color, description),
+                                  default_size, build_placeholder)
     except Exception as e:
         # Emergency fallback
         surface = pygame.Surface(default_size, pygame.SRCALPHA)
         pygame.draw.rect(surface, (255, 0, 0), (0, 0, default_size[0], default_size[1]))
         return surface
 
-def load_sound_safe(path):
-    """Safely load sound or return silent sound"""
-    try:
-        if os.path.exists(path):
-            return pygame.mixer.Sound(path)
-        else:
-            return pygame.mixer.Sound(buffer=bytearray([]))  # Silent sound
-    except Exception as e:
-        return pygame.mixer.Sound(buffer=bytearray([]))  # Silent sound
-
 def draw_button(screen, text, x, y, width, height, inactive_color, active_color, text_color=(255, 255, 255), action=None):
     """Draw a button with hover effect"""
-    mouse = pygame.mouse.get_pos()
+    mouse = get_mouse_pos()
     click = pygame.mouse.get_pressed()
     
     button_rect = pygame.Rect(x, y, width, height)
     
     # Check if mouse is over button
-    if button_rect.collidepoint(mouse):
-        pygame.draw.rect(screen, active_color, button_rect, border_radius=12)
-        if click[0] == 1 and action is not None:
-            action()
-    else:
-        pygame.draw.rect(screen, inactive_color, button_rect, border_radius=12)
+    hovered = button_rect.collidepoint(mouse)
+    if hovered and click[0] == 1 and action is not None:
+        action()
     
-    # Add button border
-    pygame.draw.rect(screen, (50, 50, 50), button_rect, 2, border_radius=12)
-    
-    # Button text
-    font = pygame.font.SysFont('Arial', 30)
-    text_surf = font.render(text, True, text_color)
-    text_rect = text_surf.get_rect(center=button_rect.center)
-    screen.blit(text_surf, text_rect)
+    # Prebuilt button with border and text
+    color = active_color if hovered else inactive_color
+    screen.blit(button_surface(text, button_rect.size, color, text_color), button_rect)
     
     return button_rect
 
-def main():
+def main(dirty_rects=False, seed=None, record=None, profile=None, parallax=False, max_fps=FPS,
+         autopilot=False, db=DB_PATH, startup_report=False, config=None, scaling='auto', window_scale=None):
     """Main game function with comprehensive error handling"""
+    timer = StartupTimer(LAUNCHED)
+    timer.mark('imports')
+    game = None
+    recorder = None
+    telemetry = None
+    watcher = None
+    record_path = record
+    profiler = FrameProfiler(trace=bool(profile))
     try:
+        # Tuning file, reloaded on its own thread whenever it's saved
+        if config:
+            try:
+                watcher = ConfigWatcher(config)
+            except ConfigError as e:
+                print(f"Could not load config: {e}")
+                return
+
         # Initialize pygame
         if not safe_init():
             input("Press Enter to exit...")
             return
+        timer.mark('pygame init')
 
         # Screen setup
-        WIDTH, HEIGHT = 800, 400
-        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # Everything draws on screen at WIDTH x HEIGHT, the display scales it up to the window
+        display = ScaledDisplay(scaling, window_scale)
+        screen = display.surface
         pygame.display.set_caption("Shinchan's Jungle Run")
         clock = pygame.time.Clock()
+        tracker = DirtyRects((WIDTH, HEIGHT), enabled=dirty_rects, present=display.present)
+        timer.mark('window')
 
         # Colors
         LIGHT_GREEN = (200, 240, 200)
@@ -110,84 +135,104 @@ def main():
         GOLD = (255, 215, 0)
 
         # Load assets safely
-        # Images
-        bg_img = load_image_safe("assets/shinchan_files/jungle_bg.png", (WIDTH, HEIGHT), (100, 150, 100), "BG")
+        # Images: only the home screen's own before its first frame, the rest load while it shows
         home_bg = load_image_safe("assets/shinchan_files/home_bg.png", (WIDTH, HEIGHT), (150, 200, 150), "HOME")
-        player_img = load_image_safe("assets/shinchan_files/shinchan.png", (80, 80), (255, 150, 150), "SHINCHAN")
-        choco_img = load_image_safe("assets/shinchan_files/chocobee.png", (50, 50), (255, 215, 0), "CHOCO")
-        pudding_img = load_image_safe("assets/shinchan_files/pudding.png", (50, 50), (150, 100, 200), "PUDDING")
-        obstacle_img = load_image_safe("assets/shinchan_files/obstacle.png", (100, 100), (120, 80, 60), "OBSTACLE")
-        parents_img = load_image_safe("assets/shinchan_files/parents.png", (100, 180), (200, 150, 150), "PARENTS")
-
-        # Sounds
-        jump_sound = load_sound_safe("assets/sounds/jump.mp3")
-        collect_sound = load_sound_safe("assets/sounds/collect.mp3")
-        win_sound = load_sound_safe("assets/sounds/win.mp3")
-        crash_sound = load_sound_safe("assets/sounds/crash.mp3")
-        double_jump_sound = load_sound_safe("assets/sounds/double_jump.mp3")
-        button_sound = load_sound_safe("assets/sounds/button.mp3")
-
-        # Try to load background music
-        try:
-            if os.path.exists("assets/sounds/bg_music.mp3"):
-                pygame.mixer.music.load("assets/sounds/bg_music.mp3")
-                pygame.mixer.music.set_volume(0.5)
-                pygame.mixer.music.play(-1)
-        except:
-            pass
-
-        # Font function
-        def get_font(size):
-            return pygame.font.SysFont('Arial', size)
+        timer.mark('home image')
+
+        def image_job(*args):
+            return lambda: load_image_safe(*args)
+
+        images = BackgroundLoader([
+            ('bg', image_job("assets/shinchan_files/jungle_bg.png", (WIDTH, HEIGHT), (100, 150, 100), "BG")),
+            ('player', image_job("assets/shinchan_files/shinchan.png", (80, 80), (255, 150, 150), "SHINCHAN")),
+            ('choco', image_job("assets/shinchan_files/chocobee.png", (50, 50), (255, 215, 0), "CHOCO")),
+            ('pudding', image_job("assets/shinchan_files/pudding.png", (50, 50), (150, 100, 200), "PUDDING")),
+            ('obstacle', image_job("assets/shinchan_files/obstacle.png", (100, 100), (120, 80, 60), "OBSTACLE")),
+            ('parents', image_job("assets/shinchan_files/parents.png", (100, 180), (200, 150, 150), "PARENTS")),
+        ], timer)
+
+        # Sounds decode in the background, silent until ready
+        sounds = SoundManager({
+            JUMP: "assets/sounds/jump.mp3",
+            COLLECT: "assets/sounds/collect.mp3",
+            WIN: "assets/sounds/win.mp3",
+            CRASH: "assets/sounds/crash.mp3",
+            DOUBLE_JUMP: "assets/sounds/double_jump.mp3",
+            'button': "assets/sounds/button.mp3",
+        })
 
         # Draw text function
         def draw_text(text, x, y, size=30, color=BLACK, center=False):
-            font = get_font(size)
-            text_surface = font.render(text, True, color)
+            text_surface = render_text(text, size, color)
             if center:
                 text_rect = text_surface.get_rect(center=(x, y))
             else:
                 text_rect = text_surface.get_rect(topleft=(x, y))
             screen.blit(text_surface, text_rect)
+            tracker.add(('text', x, y), text_rect, (text, color))
             return text_rect
 
-        # Game state variables
-        class GameState:
-            def __init__(self):
-                self.reset()
-            
-            def reset(self):
-                self.player_x = 100
-                self.player_y = 300
-                self.player_velocity = 0
-                self.gravity = 1
-                self.is_jumping = False
-                self.jump_count = 0  # Track jumps for double jump
-                self.can_double_jump = False  # Can perform double jump
-                self.score = 0
-                self.choco_count = 0
-                self.pudding_count = 0
-                self.distance = 0
-                self.game_speed = 5
-                self.game_over = False
-                self.game_won = False
-                self.items = []  # Collectible items
-                self.obstacles = []  # Obstacles to avoid
-                self.parents_x = WIDTH + 2000  # Parents at the end
-                self.parents_spawned = False
-                self.bg_x = 0  # Background scroll position
-                self.last_jump_time = 0  # For double jump timing
-
-        game = GameState()
+        game = GameState(seed, watcher.config if watcher else None, background_levels=True)
+        pilot = None  # Presses SPACE instead of the player
+        if autopilot:
+            from bot import Autopilot
+            pilot = Autopilot(game.tuning)
+        telemetry = TelemetryStore(db) if db else None  # Loads the leaderboard in the background
+        run_started = time.perf_counter()
+        run_frames = FrameHistogram()  # Every frame time of the current run
+        last_run = None  # Telemetry row of the run that just ended
+
+        def record_run(outcome):
+            """Hand the finished run to the telemetry writer"""
+            nonlocal last_run
+            if telemetry is None:
+                return
+            last_run = run_record(game, outcome, (time.perf_counter() - run_started) * 1000,
+                                  run_frames.percentiles(), pilot is not None)
+            telemetry.record(last_run)
+        if record:
+            from replay import InputRecorder, numbered_path
+            recorder = InputRecorder(game.seed, game.config.changes())
+        run_number = 1
+
+        def apply_config():
+            """Switch to a reloaded config between runs (never mid-run), True if it changed"""
+            nonlocal pilot
+            if watcher is None or game.config is watcher.config:
+                return False
+            game.configure(watcher.config)
+            if pilot is not None:
+                from bot import Autopilot
+                pilot = Autopilot(game.tuning)  # Its jump arcs depend on the tuning
+            print(f"Config reloaded from {watcher.path}: {game.config}")
+            return True
 
         # Button actions
         def start_game():
-            button_sound.play()
+            sounds.play('button')
             return False  # Exit home screen
 
         def restart_game():
-            button_sound.play()
-            game.reset()
+            nonlocal recorder, record_path, run_number, run_started
+            sounds.play('button')
+            run_started = time.perf_counter()
+            run_frames.reset()
+            apply_config()
+            if recorder is not None and game.frame > 0:
+                # Keep the finished run and start recording the next one
+                recorder.save(record_path, game)
+                run_number += 1
+                record_path = numbered_path(record, run_number)
+                game.reset(seed)
+                recorder = InputRecorder(game.seed, game.config.changes())
+            else:
+                game.reset(seed)
+
+        def start_autopilot():
+            nonlocal pilot
+            from bot import Autopilot
+            sounds.play('button')
+            pilot = Autopilot(game.tuning)
 
         def quit_game():
             pygame.quit()
@@ -195,6 +240,9 @@ def main():
 
         # Simple home screen
         home_screen_active = True
+        home_shown = False
+        home_buttons = []
+        last_frame_key = None
         while home_screen_active:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -203,10 +251,22 @@ def main():
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
                         home_screen_active = False
+                    if event.key == pygame.K_a:
+                        start_autopilot()
+                        home_screen_active = False
                     if event.key == pygame.K_ESCAPE:
                         pygame.quit()
                         return
-            
+
+            # Nothing on the home screen moves, only redraw when hover/click changes
+            mouse_pos = get_mouse_pos()
+            frame_key = (pygame.mouse.get_pressed()[0],
+                         tuple(button.collidepoint(mouse_pos) for button in home_buttons))
+            if dirty_rects and frame_key == last_frame_key:
+                clock.tick(60)
+                continue
+            last_frame_key = frame_key
+
             # Draw home screen
             screen.blit(home_bg, (0, 0))
             
@@ -221,320 +281,299 @@ def main():
                 screen, 
                 "START GAME", 
                 WIDTH//2 - 100, 
-                250, 
+                230, 
                 200, 
-                60, 
+                55, 
                 GREEN, 
                 BRIGHT_GREEN, 
                 WHITE, 
                 start_game
             )
             
+            # Draw autopilot button
+            pilot_button = draw_button(
+                screen,
+                "AUTOPILOT",
+                WIDTH//2 - 100,
+                295,
+                200,
+                45,
+                GREEN,
+                BRIGHT_GREEN,
+                WHITE
+            )
+
             # Draw quit button
             quit_button = draw_button(
                 screen,
                 "QUIT",
                 WIDTH//2 - 100,
-                330,
+                350,
                 200,
-                50,
+                40,
                 DARK_GREEN,
                 GREEN,
                 WHITE,
                 quit_game
             )
+            home_buttons = [start_button, pilot_button, quit_button]
             
             # Handle button clicks
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = get_mouse_pos()
             mouse_click = pygame.mouse.get_pressed()
             
             if start_button.collidepoint(mouse_pos) and mouse_click[0]:
                 home_screen_active = start_game()
+            elif pilot_button.collidepoint(mouse_pos) and mouse_click[0]:
+                start_autopilot()
+                home_screen_active = False
             elif quit_button.collidepoint(mouse_pos) and mouse_click[0]:
                 quit_game()
             
-            pygame.display.flip()
+            tracker.add('home_bg', tracker.screen_rect)
+            for button in home_buttons:
+                tracker.add(('button', button.topleft), button, button.collidepoint(mouse_pos))
+            tracker.flush()
+            if not home_shown:
+                # The menu is up, everything else loads behind it
+                home_shown = True
+                timer.mark('first home frame')
+                print(f"Home screen shown after {(time.perf_counter() - timer.origin) * 1000:.0f} ms")
+                images.start()
+                sounds.start()
+                sounds.play_music("assets/sounds/bg_music.mp3")  # Starts once the mixer is open
+            if startup_report and images.ready and sounds.ready:
+                print_startup_report(timer, sounds)
+                startup_report = False
             clock.tick(60)
 
-        # Timers for spawning objects
-        item_spawn_timer = 0
-        obstacle_spawn_timer = 0
-
-        # Main game loop
+        # Usually finished long before anyone presses START
+        loaded = images.wait()
+        timer.mark('wait for images')
+        if startup_report:
+            print_startup_report(timer, sounds)
+        bg_img, player_img, choco_img, pudding_img, obstacle_img, parents_img = (
+            loaded[name] for name in ('bg', 'player', 'choco', 'pudding', 'obstacle', 'parents'))
+        background = ParallaxBackground(jungle_layers(bg_img) if parallax else single_layer(bg_img), (WIDTH, HEIGHT))
+        sprites = SpriteBatch(['items', 'obstacles', 'actors'])  # Back to front
+        item_layer, obstacle_layer, actor_layer = sprites['items'], sprites['obstacles'], sprites['actors']
+        if apply_config():
+            game.reset(game.seed)  # Saved while the menu was up
+            if recorder is not None:
+                recorder = InputRecorder(game.seed, game.config.changes())
+
+        # Frame profiler overlay (F3)
+        show_profiler = False
+        profiler_lines = []
+
+        def draw_profiler_overlay():
+            nonlocal profiler_lines
+            # Refresh twice a second so the numbers are readable and the text cache isn't churned
+            if not profiler_lines or profiler.count % 30 == 0:
+                profiler_lines = ["phase      p50    p95    p99 ms"]
+                for phase, (p50, p95, p99) in profiler.summary().items():
+                    profiler_lines.append(f"{phase:<9}{p50:>6.2f} {p95:>6.2f} {p99:>6.2f}")
+                profiler_lines.append(f"{clock.get_fps():.0f} fps, {dropped_steps} steps dropped")
+            box = pygame.Rect(10, HEIGHT - 20 - 16 * len(profiler_lines), 250, 16 * len(profiler_lines) + 10)
+            pygame.draw.rect(screen, BLACK, box)
+            tracker.add('profiler', box, tuple(profiler_lines))
+            for i, line in enumerate(profiler_lines):
+                draw_text(line, box.x + 6, box.y + 5 + 16 * i, 14, WHITE)
+
+        def draw_leaderboard():
+            """Best runs from the in-memory leaderboard, the run that just ended in gold"""
+            board = telemetry.leaderboard
+            box = pygame.Rect(WIDTH - 200, 130, 185, 36 + 22 * len(board))
+            screen.blit(overlay_surface(box.size, (0, 0, 0, 120)), box)
+            draw_text("BEST RUNS", box.centerx, box.y + 16, 20, YELLOW, center=True)
+            for i, (score, outcome, distance, started) in enumerate(board):
+                mine = last_run is not None and started == last_run[0]
+                draw_text(f"{i + 1}. {score:>4}  {outcome}", box.x + 14, box.y + 32 + 22 * i, 18,
+                          GOLD if mine else WHITE)
+
+        def build_end_screen():
+            """Draw the end overlay and titles once and keep the whole frame as a static layer"""
+            if game.game_over:
+                screen.blit(overlay_surface((WIDTH, HEIGHT), (0, 0, 0, 150)), (0, 0))
+                draw_text("GAME OVER", WIDTH//2, HEIGHT//2 - 80, 60, RED, center=True)
+                draw_text(f"Final Score: {game.score}", WIDTH//2, HEIGHT//2 - 30, 30, WHITE, center=True)
+                buttons_y = HEIGHT//2 + 20
+            else:
+                screen.blit(overlay_surface((WIDTH, HEIGHT), (0, 100, 0, 150)), (0, 0))
+                draw_text("YOU WIN!", WIDTH//2, HEIGHT//2 - 80, 60, GOLD, center=True)
+                draw_text("You found your parents!", WIDTH//2, HEIGHT//2 - 30, 30, WHITE, center=True)
+                draw_text(f"Final Score: {game.score}", WIDTH//2, HEIGHT//2 + 10, 30, WHITE, center=True)
+                buttons_y = HEIGHT//2 + 50
+            if telemetry is not None and telemetry.leaderboard:
+                draw_leaderboard()
+            return EndScreen(screen.copy(), [
+                Button("PLAY AGAIN", (WIDTH//2 - 100, buttons_y, 200, 50), GREEN, BRIGHT_GREEN, WHITE),
+                Button("MAIN MENU", (WIDTH//2 - 100, buttons_y + 70, 200, 50), DARK_GREEN, GREEN, WHITE),
+            ])
+
+        # Main game loop: the simulation runs in fixed 60 Hz steps paid for out of
+        # real elapsed time, while frames render as often as max_fps allows
         running = True
+        end_screen = None
+        end_buttons = []
+        last_frame_key = None
+        tracker.invalidate()
+        frame_ms = 0  # Real time the previous frame took
+        accumulator = 0.0  # Real time not yet simulated
+        dropped_steps = 0  # Steps given up because the machine couldn't keep up
+        jump_presses = 0  # Presses waiting for the next step
+        clock.tick()
+        run_started = time.perf_counter()
+        run_frames.reset()
         while running:
+            profiler.begin_frame()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                if event.type == pygame.WINDOWEXPOSED:
+                    tracker.invalidate()
+                    last_frame_key = None
+                    if end_screen is not None:
+                        end_screen.invalidate()
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and not game.game_over and not game.game_won:
-                        current_time = pygame.time.get_ticks()
-                        
-                        # First jump (on ground)
-                        if not game.is_jumping:
-                            game.player_velocity = -18  # First jump force
-                            game.is_jumping = True
-                            game.jump_count = 1
-                            game.can_double_jump = True
-                            jump_sound.play()
-                        
-                        # Double jump (in air, within time window)
-                        elif game.is_jumping and game.can_double_jump and game.jump_count < 2:
-                            # Check if we're within double jump window (300ms after first jump)
-                            if current_time - game.last_jump_time < 300:
-                                game.player_velocity = -16  # Slightly less force for double jump
-                                game.jump_count = 2
-                                game.can_double_jump = False  # Can't triple jump
-                                if double_jump_sound.get_length() > 0:  # Only play if sound exists
-                                    double_jump_sound.play()
-                            else:
-                                # Too late for double jump
-                                game.can_double_jump = False
-                        
-                        game.last_jump_time = current_time
-                        
+                    if event.key == pygame.K_SPACE:
+                        jump_presses += 1
                     if event.key == pygame.K_ESCAPE:
                         running = False
-
-            if not game.game_over and not game.game_won:
-                # Apply gravity
-                game.player_velocity += game.gravity
-                game.player_y += game.player_velocity
-
-                # Ground collision
-                if game.player_y >= 300:
-                    game.player_y = 300
-                    game.player_velocity = 0
-                    game.is_jumping = False
-                    game.jump_count = 0
-                    game.can_double_jump = False
-
-                # Update distance and speed
-                game.distance += game.game_speed
-                if game.distance % 500 == 0:  # Increase speed every 500 units
-                    game.game_speed += 0.5
-
-                # Scroll background
-                game.bg_x -= game.game_speed
-                if game.bg_x <= -WIDTH:
-                    game.bg_x = 0
-
-                # Spawn collectible items
-                item_spawn_timer += 1
-                if item_spawn_timer > 60:  # Spawn every 60 frames
-                    item_type = random.choice(['choco', 'pudding'])
-                    item_img = choco_img if item_type == 'choco' else pudding_img
-                    item_y = random.randint(200, 280)  # Random height
-                    game.items.append({
-                        'type': item_type,
-                        'img': item_img,
-                        'rect': pygame.Rect(WIDTH, item_y, 40, 40),
-                        'collected': False
-                    })
-                    item_spawn_timer = 0
-
-                # Spawn obstacles
-                obstacle_spawn_timer += 1
-                if obstacle_spawn_timer > 90:  # Spawn every 90 frames
-                    game.obstacles.append({
-                        'img': obstacle_img,
-                        'rect': pygame.Rect(WIDTH, 320, 60, 60)
-                    })
-                    obstacle_spawn_timer = 0
-
-                # Update items
-                for item in game.items[:]:
-                    item['rect'].x -= game.game_speed
-                    
-                    # Check collection
-                    player_rect = pygame.Rect(game.player_x, game.player_y, 60, 60)
-                    if player_rect.colliderect(item['rect']) and not item['collected']:
-                        item['collected'] = True
-                        collect_sound.play()
-                        game.score += 1
-                        if item['type'] == 'choco':
-                            game.choco_count += 1
-                        else:
-                            game.pudding_count += 1
-                            game.score += 2  # Extra points for pudding
-                        game.items.remove(item)
-                    elif item['rect'].right < 0:
-                        game.items.remove(item)
-
-                # Update obstacles
-                for obstacle in game.obstacles[:]:
-                    obstacle['rect'].x -= game.game_speed
-                    
-                    # Check collision
-                    player_rect = pygame.Rect(game.player_x, game.player_y, 60, 60)
-                    if player_rect.colliderect(obstacle['rect']):
-                        game.game_over = True
-                        crash_sound.play()
-                    elif obstacle['rect'].right < 0:
-                        game.obstacles.remove(obstacle)
-
-                # Check if parents should appear
-                if game.distance >= 1500 and not game.parents_spawned:
-                    game.parents_spawned = True
-
-                # Update parents position
-                if game.parents_spawned:
-                    game.parents_x -= game.game_speed
-                    
-                    # Check if reached parents
-                    player_rect = pygame.Rect(game.player_x, game.player_y, 60, 60)
-                    parents_rect = pygame.Rect(game.parents_x, 220, 80, 160)
-                    if player_rect.colliderect(parents_rect):
-                        game.game_won = True
-                        win_sound.play()
-
-            # Draw everything
-            screen.fill(LIGHT_GREEN)
-            
-            # Draw scrolling background
-            screen.blit(bg_img, (game.bg_x, 0))
-            screen.blit(bg_img, (game.bg_x + WIDTH, 0))
-            
-            # Draw collectible items
-            for item in game.items:
-                screen.blit(item['img'], item['rect'])
-            
-            # Draw obstacles
-            for obstacle in game.obstacles:
-                screen.blit(obstacle['img'], obstacle['rect'])
-            
-            # Draw parents if spawned
-            if game.parents_spawned:
-                screen.blit(parents_img, (game.parents_x, 220))
+                    if event.key == pygame.K_F3:
+                        show_profiler = not show_profiler
+                        last_frame_key = None
+                        if end_screen is not None:
+                            end_screen.invalidate()
+            profiler.lap('events')
+
+            # Advance the simulation by however many fixed steps real time has covered
+            accumulator += frame_ms
+            events = []
+            steps = 0
+            while accumulator >= FRAME_MS and steps < MAX_CATCH_UP_STEPS:
+                if pilot is not None and pilot(game):
+                    jump_presses += 1
+                for _ in range(jump_presses):
+                    if recorder is not None:
+                        recorder.press(game.frame)
+                    event = game.jump()
+                    if event:
+                        events.append(event)
+                jump_presses = 0
+                profiler.lap('input')  # Autopilot decisions and jumps, kept out of physics
+                events.extend(game.update(profiler.lap))
+                accumulator -= FRAME_MS
+                steps += 1
+            if accumulator >= FRAME_MS:
+                # Too far behind: drop whole steps so the game slows down instead of spiralling
+                skipped = int(accumulator // FRAME_MS)
+                accumulator -= skipped * FRAME_MS
+                dropped_steps += skipped
+            if CRASH in events or WIN in events:
+                record_run('won' if game.game_won else 'lost')
+                if recorder is not None:
+                    recorder.save(record_path, game)
+
+            for event in events:
+                sounds.play(event)
+            profiler.lap('events')
+
+            # Draw the world between the last two steps: alpha is how far real time
+            # has got towards the next step (a finished run is drawn as it ended)
+            alpha = 1.0 if game.finished else accumulator / FRAME_MS
+            step_distance = game.distance - game.prev_distance
+            behind = round(step_distance * (1 - alpha))  # Scrolling things are this far right of their step position
+            player_y = round(game.prev_player_y + (game.player_y - game.prev_player_y) * alpha)
+            scroll = game.distance - step_distance * (1 - alpha)
+
+            # Once the game has ended the scene is frozen, so in dirty-rect mode
+            # a frame with no new step and no hover/click change is skipped entirely
+            mouse_pos = get_mouse_pos()
+            frame_key = (game.frame, behind, player_y, game.game_over, game.game_won,
+                         pygame.mouse.get_pressed()[0],
+                         tuple(button.collidepoint(mouse_pos) for button in end_buttons))
+            if dirty_rects and frame_key == last_frame_key:
+                run_frames.add((time.perf_counter() - profiler.frame_start) * 1000)
+                frame_ms = clock.tick(max_fps)
+                continue
+            last_frame_key = frame_key
+
+            if end_screen is not None:
+                # Run has ended: the frozen frame is one cached layer, only buttons change
+                end_screen.draw(screen, mouse_pos, tracker)
+            else:
+                # Draw everything
+                if not background.covers_screen:
+                    screen.fill(LIGHT_GREEN)
             
-            # Draw player
-            screen.blit(player_img, (game.player_x, game.player_y))
+                # Draw scrolling background
+                background.draw(screen, scroll)
+                tracker.add('bg', tracker.screen_rect, scroll)
             
-            # Draw jump indicator
-            if game.is_jumping and game.can_double_jump and game.jump_count == 1:
-                # Show double jump available indicator
-                indicator_color = BLUE
-                pygame.draw.circle(screen, indicator_color, (game.player_x + 40, game.player_y - 20), 8)
-
-            # Draw UI
-            draw_text(f"Score: {game.score}", 20, 20, 25, BLACK)
-            draw_text(f"Chocobees: {game.choco_count}", 20, 50, 20, BLACK)
-            draw_text(f"Puddings: {game.pudding_count}", 20, 75, 20, BLACK)
-            draw_text(f"Distance: {min(game.distance, 2000)}/2000", 20, 100, 20, BLACK)
+                # Queue collectible items, obstacles, parents and the player, then
+                # draw each layer with one batched blit
+                for item in game.items:
+                    item_img = choco_img if item.kind == 'choco' else pudding_img
+                    item_layer.add(item_img, item.rect.move(behind, 0), item, item.kind)
+                for obstacle in game.obstacles:
+                    obstacle_layer.add(obstacle_img, obstacle.rect.move(behind, 0), obstacle)
+                if game.parents_spawned:
+                    actor_layer.add(parents_img, (game.parents_x + behind, 220), 'parents')
+                actor_layer.add(player_img, (game.player_x, player_y), 'player')
+                sprites.draw(screen, tracker)
             
-            # Draw jump status
-            if game.jump_count == 1:
-                draw_text("Jump: 1/2", WIDTH - 80, 20, 18, BLUE)
-            elif game.jump_count == 2:
-                draw_text("Jump: 2/2", WIDTH - 80, 20, 18, RED)
-            else:
-                draw_text("Jump: 0/2", WIDTH - 80, 20, 18, BLACK)
+                # Draw jump indicator
+                if game.is_jumping and game.can_double_jump and game.jump_count == 1:
+                    # Show double jump available indicator
+                    indicator_color = BLUE
+                    indicator = pygame.draw.circle(screen, indicator_color, (game.player_x + 40, player_y - 20), 8)
+                    tracker.add('indicator', indicator)
+                profiler.lap('render')
+
+                # Draw UI
+                draw_text(f"Score: {game.score}", 20, 20, 25, BLACK)
+                draw_text(f"Chocobees: {game.choco_count}", 20, 50, 20, BLACK)
+                draw_text(f"Puddings: {game.pudding_count}", 20, 75, 20, BLACK)
+                draw_text(f"Distance: {min(game.distance, game.goal_distance)}/{game.goal_distance}", 20, 100, 20, BLACK)
             
-            # Draw instructions
-            if not game.game_over and not game.game_won:
-                draw_text("SPACE: Jump", WIDTH - 100, 45, 16, BLACK)
-                draw_text("Double SPACE: Double Jump", WIDTH - 130, 65, 16, BLACK)
+                # Draw jump status
+                if game.jump_count == 1:
+                    draw_text("Jump: 1/2", WIDTH - 80, 20, 18, BLUE)
+                elif game.jump_count == 2:
+                    draw_text("Jump: 2/2", WIDTH - 80, 20, 18, RED)
+                else:
+                    draw_text("Jump: 0/2", WIDTH - 80, 20, 18, BLACK)
             
-            # Game over screen
-            if game.game_over:
-                overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 150))
-                screen.blit(overlay, (0, 0))
-                
-                draw_text("GAME OVER", WIDTH//2, HEIGHT//2 - 80, 60, RED, center=True)
-                draw_text(f"Final Score: {game.score}", WIDTH//2, HEIGHT//2 - 30, 30, WHITE, center=True)
-                
-                # Restart button
-                restart_button = draw_button(
-                    screen,
-                    "PLAY AGAIN",
-                    WIDTH//2 - 100,
-                    HEIGHT//2 + 20,
-                    200,
-                    50,
-                    GREEN,
-                    BRIGHT_GREEN,
-                    WHITE,
-                    restart_game
-                )
-                
-                # Quit button
-                menu_button = draw_button(
-                    screen,
-                    "MAIN MENU",
-                    WIDTH//2 - 100,
-                    HEIGHT//2 + 90,
-                    200,
-                    50,
-                    DARK_GREEN,
-                    GREEN,
-                    WHITE,
-                    lambda: [restart_game(), setattr(game, 'game_over', False), setattr(game, 'game_won', False)]
-                )
-                
-                # Handle button clicks
-                mouse_pos = pygame.mouse.get_pos()
-                mouse_click = pygame.mouse.get_pressed()
-                
-                if restart_button.collidepoint(mouse_pos) and mouse_click[0]:
-                    restart_game()
-                elif menu_button.collidepoint(mouse_pos) and mouse_click[0]:
-                    restart_game()
-                    game.game_over = False
-                    game.game_won = False
-                    # Return to home screen would need additional logic
+                # Draw instructions
+                if pilot is not None:
+                    draw_text("AUTOPILOT", WIDTH - 100, 45, 16, BLUE)
+                elif not game.game_over and not game.game_won:
+                    draw_text("SPACE: Jump", WIDTH - 100, 45, 16, BLACK)
+                    draw_text("Double SPACE: Double Jump", WIDTH - 130, 65, 16, BLACK)
             
-            # Game won screen
-            if game.game_won:
-                overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 100, 0, 150))
-                screen.blit(overlay, (0, 0))
-                
-                draw_text("YOU WIN!", WIDTH//2, HEIGHT//2 - 80, 60, GOLD, center=True)
-                draw_text("You found your parents!", WIDTH//2, HEIGHT//2 - 30, 30, WHITE, center=True)
-                draw_text(f"Final Score: {game.score}", WIDTH//2, HEIGHT//2 + 10, 30, WHITE, center=True)
-                
-                # Restart button
-                restart_button = draw_button(
-                    screen,
-                    "PLAY AGAIN",
-                    WIDTH//2 - 100,
-                    HEIGHT//2 + 50,
-                    200,
-                    50,
-                    GREEN,
-                    BRIGHT_GREEN,
-                    WHITE,
-                    restart_game
-                )
-                
-                # Menu button
-                menu_button = draw_button(
-                    screen,
-                    "MAIN MENU",
-                    WIDTH//2 - 100,
-                    HEIGHT//2 + 120,
-                    200,
-                    50,
-                    DARK_GREEN,
-                    GREEN,
-                    WHITE,
-                    lambda: [restart_game(), setattr(game, 'game_over', False), setattr(game, 'game_won', False)]
-                )
-                
-                # Handle button clicks
-                mouse_pos = pygame.mouse.get_pos()
-                mouse_click = pygame.mouse.get_pressed()
-                
-                if restart_button.collidepoint(mouse_pos) and mouse_click[0]:
-                    restart_game()
-                elif menu_button.collidepoint(mouse_pos) and mouse_click[0]:
+                if game.finished:
+                    end_screen = build_end_screen()
+                    end_screen.draw(screen, mouse_pos, tracker)
+                    end_buttons = [button.rect for button in end_screen.buttons]
+
+            # Handle button clicks
+            if end_screen is not None and pygame.mouse.get_pressed()[0]:
+                if end_screen.button_at(mouse_pos) is not None:
+                    # Both PLAY AGAIN and MAIN MENU start a new run
                     restart_game()
-                    game.game_over = False
-                    game.game_won = False
-            
-            pygame.display.flip()
-            clock.tick(60)
+                    end_screen = None
+                    end_buttons = []
+
+            if show_profiler:
+                draw_profiler_overlay()
+            profiler.lap('hud')
+
+            tracker.flush()
+            profiler.lap('flip')
+            profiler.end_frame()
+            run_frames.add((profiler.last - profiler.frame_start) * 1000)
+            frame_ms = clock.tick(max_fps)
 
         print("Game ended normally")
         
@@ -544,7 +583,94 @@ def main():
         input("Press Enter to exit...")
     
     finally:
+        if recorder is not None and game is not None and game.frame > 0:
+            recorder.save(record_path, game)
+        if profile:
+            profiler.export(profile)
+            print(f"Frame trace written to {profile}")
+        if game is not None:
+            game.close()
+        if telemetry is not None:
+            if game is not None and game.frame > 0 and not game.finished:
+                record_run('quit')
+            telemetry.close()
+        if watcher is not None:
+            watcher.close()
+        clear_cache()
+        clear_layers()
         pygame.quit()
 
+def print_startup_report(timer, sounds):
+    """Where the time went between launch and a fully loaded game"""
+    print("Startup report:")
+    for line in timer.report():
+        print(f"  {line}")
+    metrics = sounds.metrics()
+    if metrics['ready_ms'] is None:
+        print("  sounds still loading")
+        return
+    effects = ', '.join(f"{name} {ms:.1f}" for name, ms in metrics['load_ms'].items())
+    print(f"  mixer opened in {metrics['mixer_ms']:.1f} ms, effects decoded ({effects} ms), "
+          f"all sounds ready {metrics['ready_ms']:.1f} ms after the loader was created")
+
+def run_replay(path):
+    """Replay a recording headlessly and report whether it reproduced, returns an exit code"""
+    from replay import ReplayError, replay, load as load_recording
+    try:
+        recording = load_recording(path)
+        game, matches = replay(recording)
+    except (OSError, ReplayError) as e:
+        print(f"Could not read recording: {e}")
+        return 2
+    if recording.tuning:
+        print(f"Tuning: {', '.join(f'{name}={value}' for name, value in recording.tuning.items())}")
+    result = "won" if game.game_won else "lost" if game.game_over else "unfinished"
+    print(f"Seed {recording.seed}: {game.frame} frames, score {game.score}, distance {game.distance}, {result}")
+    if not matches:
+        print("Replay diverged from the recorded run")
+        return 1
+    print("Replay matches the recorded run")
+    return 0
+
+def parse_args(argv=None):
+    """Command line options for the interactive game"""
+    parser = argparse.ArgumentParser(description="Shinchan's Jungle Run")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help='only push changed screen regions instead of flipping the whole display')
+    parser.add_argument('--parallax', action='store_true',
+                        help='scroll the jungle scenery slower than the path for depth')
+    parser.add_argument('--seed', type=int,
+                        help='seed for item spawning, makes every run reproducible')
+    parser.add_argument('--record', metavar='PATH',
+                        help='save each run\'s SPACE presses to PATH (run-2.sjr, run-3.sjr... for later runs)')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='rebuild a recorded run without a window and check it matches')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='write per-frame phase timings on exit (.csv, or Chrome trace .json)')
+    parser.add_argument('--autopilot', action='store_true',
+                        help='let the built-in bot play (also on the home screen, or press A there)')
+    parser.add_argument('--db', default=DB_PATH, metavar='PATH',
+                        help=f'SQLite file for run telemetry and the leaderboard (default {DB_PATH}, "" to disable)')
+    parser.add_argument('--max-fps', type=int, default=FPS,
+                        help=f'cap on rendered frames per second, 0 for uncapped (default {FPS}); '
+                             'the game itself always steps at 60 Hz')
+    parser.add_argument('--scaling', choices=SCALING_MODES, default='auto',
+                        help='how the 800x400 frame reaches big displays: sdl (GPU), texture (one software '
+                             'scale per frame), window (no scaling), auto (sdl when the screen fits 2x, default)')
+    parser.add_argument('--window-scale', type=int, metavar='N',
+                        help='whole-number upscale for texture mode, auto with 1 keeps a plain window '
+                             '(default: largest that fits the screen)')
+    parser.add_argument('--config', metavar='PATH',
+                        help='TOML or JSON file of tuning values, reloaded between runs whenever it is saved')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='print how long each startup phase took once everything has loaded')
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.replay:
+        sys.exit(run_replay(args.replay))
+    main(dirty_rects=args.dirty_rects, seed=args.seed, record=args.record, profile=args.profile,
+         parallax=args.parallax, max_fps=args.max_fps, autopilot=args.autopilot,
+         db=args.db, startup_report=args.startup_report, config=args.config,
+         scaling=args.scaling, window_scale=args.window_scale)
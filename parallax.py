@@ -0,0 +1,185 @@
+"""
+Shinchan Jungle Run - Parallax Background
+Each layer is pre-tiled into a strip wide enough that one blit of a
+sub-rect covers the screen at any scroll offset, so a layer never needs
+the two-blit wrap. Opaque layers that scroll at the same rate are
+composited into one strip, rows hidden behind nearer opaque layers are
+never drawn, and alpha layers only blit the rows that have visible
+pixels.
+
+Run this file directly for the frame-time budget check against the
+original single background drawn with fill + two full blits.
+"""
+
+import os
+import sys
+import time
+import pygame
+from asset_cache import to_display_format
+
+
+class ParallaxLayer:
+    def __init__(self, image, rate, y=0, opaque=None):
+        self.image = image
+        self.rate = rate  # Scroll speed relative to the game world (1.0 = ground speed)
+        self.y = y
+        self.opaque = not (image.get_flags() & pygame.SRCALPHA) if opaque is None else opaque
+
+    @property
+    def rows(self):
+        return (self.y, self.y + self.image.get_height())
+
+
+def _subtract(spans, start, end):
+    """Remove [start, end) from a list of (start, end) row spans"""
+    result = []
+    for span_start, span_end in spans:
+        if end <= span_start or start >= span_end:
+            result.append((span_start, span_end))
+            continue
+        if span_start < start:
+            result.append((span_start, start))
+        if end < span_end:
+            result.append((end, span_end))
+    return result
+
+
+class _Strip:
+    """A layer (or merged opaque layers) tiled horizontally, plus the row spans worth drawing"""
+
+    def __init__(self, layers, view_width):
+        self.rate = layers[0].rate
+        self.opaque = layers[0].opaque
+        top = min(layer.rows[0] for layer in layers)
+        bottom = max(layer.rows[1] for layer in layers)
+        self.y = top
+        self.period = max(layer.image.get_width() for layer in layers)
+        tiles = -(-view_width // self.period) + 1  # Enough copies for any offset
+        flags = 0 if self.opaque else pygame.SRCALPHA
+        strip = pygame.Surface((self.period * tiles, bottom - top), flags)
+        for layer in layers:
+            for tile in range(tiles):
+                strip.blit(layer.image, (tile * self.period, layer.y - top))
+        self.surface = to_display_format(strip, not self.opaque)
+
+        if self.opaque:
+            self.spans = [(layer.rows[0], layer.rows[1]) for layer in layers]
+        else:
+            # Only rows holding visible pixels
+            bounds = strip.get_bounding_rect()
+            self.spans = [(top + bounds.top, top + bounds.bottom)] if bounds.height else []
+
+
+class ParallaxBackground:
+    def __init__(self, layers, size):
+        """layers are ordered back to front"""
+        self.size = size
+        width, height = size
+
+        # Merge neighbouring opaque layers that scroll together into one strip
+        groups = []
+        for layer in layers:
+            previous = groups[-1] if groups else None
+            if (previous and layer.opaque and previous[0].opaque
+                    and layer.rate == previous[0].rate):
+                previous.append(layer)
+            else:
+                groups.append([layer])
+        self.strips = [_Strip(group, width) for group in groups]
+
+        # Rows covered by a nearer opaque strip are never visible, skip them
+        covered = []
+        for strip in reversed(self.strips):
+            spans = [(max(0, a), min(height, b)) for a, b in strip.spans]
+            for start, end in covered:
+                spans = _subtract(spans, start, end)
+            strip.spans = [(a, b) for a, b in spans if b > a]
+            if strip.opaque:
+                covered.extend(strip.spans)
+
+        # Whole screen hidden behind opaque rows means no clear is needed first
+        uncovered = [(0, height)]
+        for start, end in covered:
+            uncovered = _subtract(uncovered, start, end)
+        self.covers_screen = not uncovered
+
+    def draw(self, screen, scroll):
+        """Draw every layer for a world scroll distance (game.distance)"""
+        width = self.size[0]
+        for strip in self.strips:
+            offset = int(scroll * strip.rate) % strip.period
+            surface = strip.surface
+            top = strip.y
+            for start, end in strip.spans:
+                screen.blit(surface, (0, start), (offset, start - top, width, end - start))
+
+
+def single_layer(bg_img):
+    """Today's look: the whole background scrolling with the ground"""
+    return [ParallaxLayer(bg_img, 1.0)]
+
+
+def jungle_layers(bg_img, ground_y=348):
+    """Split the jungle background at the path: scenery drifts at half speed, the path moves with the ground"""
+    width, height = bg_img.get_size()
+    scenery = bg_img.subsurface((0, 0, width, ground_y)).copy()
+    ground = bg_img.subsurface((0, ground_y, width, height - ground_y)).copy()
+    return [ParallaxLayer(scenery, 0.5, 0, opaque=True),
+            ParallaxLayer(ground, 1.0, ground_y, opaque=True)]
+
+
+def budget_check(size=(800, 400), frames=600, layer_count=4):
+    """Time the original single-layer background against a multi-layer parallax.
+
+    Returns (single_ms, parallax_ms) per frame; the parallax should cost no more.
+    """
+    width, height = size
+    screen = pygame.display.get_surface() or pygame.display.set_mode(size)
+
+    bg_img = to_display_format(pygame.Surface(size), False)
+    bg_img.fill((100, 150, 100))
+
+    # Opaque depth bands (sky, hills, ground) plus one alpha foreground layer
+    bands = layer_count - 1
+    band_height = height // bands
+    layers = []
+    for i in range(bands):
+        band = pygame.Surface((width, band_height if i < bands - 1 else height - band_height * i))
+        band.fill((80 + 40 * i, 150, 100))
+        layers.append(ParallaxLayer(band, 0.25 + 0.75 * i / max(1, bands - 1), band_height * i))
+    foreground = pygame.Surface((width, 60), pygame.SRCALPHA)
+    for x in range(0, width, 40):
+        pygame.draw.ellipse(foreground, (40, 120, 60, 220), (x, 20, 36, 40))
+    layers.append(ParallaxLayer(foreground, 1.4, height - 60))
+    background = ParallaxBackground(layers, size)
+
+    def single(scroll):
+        bg_x = -(scroll % width)
+        screen.fill((200, 240, 200))
+        screen.blit(bg_img, (bg_x, 0))
+        screen.blit(bg_img, (bg_x + width, 0))
+
+    def parallax(scroll):
+        if not background.covers_screen:
+            screen.fill((200, 240, 200))
+        background.draw(screen, scroll)
+
+    results = []
+    for draw in (single, parallax):
+        draw(0)  # Warm up
+        start = time.perf_counter()
+        for frame in range(frames):
+            draw(frame * 5.5)
+        results.append((time.perf_counter() - start) / frames * 1000)
+    return tuple(results)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    single_ms, parallax_ms = budget_check()
+    print(f"single layer: {single_ms:.3f} ms/frame, 4-layer parallax: {parallax_ms:.3f} ms/frame")
+    if parallax_ms > single_ms:
+        print("Parallax is over the single-layer budget")
+        sys.exit(1)
+    print("Within budget")
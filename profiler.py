@@ -0,0 +1,91 @@
+"""
+Shinchan Jungle Run - Frame Profiler
+Lap timing around each phase of the main loop. Every phase keeps a
+ring buffer of recent durations for p50/p95/p99, and when a trace file
+is requested each frame is also kept for CSV or Chrome trace export.
+"""
+
+import csv
+import json
+import time
+from array import array
+from collections import deque
+
+PHASES = ('events', 'input', 'physics', 'spawning', 'items', 'obstacles', 'render', 'hud', 'flip')
+WINDOW = 600  # Frames kept for percentiles (10 seconds at 60 FPS)
+TRACE_FRAMES = 36000  # Frames kept for export (10 minutes at 60 FPS)
+
+
+class FrameProfiler:
+    def __init__(self, window=WINDOW, trace=False):
+        self.window = window
+        self.samples = {phase: array('d', bytes(8 * window)) for phase in PHASES}
+        self.samples['frame'] = array('d', bytes(8 * window))
+        self.count = 0  # Frames recorded so far
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.trace = deque(maxlen=TRACE_FRAMES) if trace else None
+        self.origin = time.perf_counter()
+        self.frame_start = self.origin
+        self.last = self.origin
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self.frame_start = now
+        self.last = now
+        current = self.current
+        for phase in current:
+            current[phase] = 0.0
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to phase"""
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        slot = self.count % self.window
+        for phase, duration in self.current.items():
+            self.samples[phase][slot] = duration
+        self.samples['frame'][slot] = self.last - self.frame_start
+        self.count += 1
+        if self.trace is not None:
+            self.trace.append((self.frame_start - self.origin, dict(self.current)))
+
+    def percentiles(self, phase, points=(50, 95, 99)):
+        """Recent durations for phase in milliseconds at the given percentiles"""
+        filled = min(self.count, self.window)
+        if not filled:
+            return tuple(0.0 for _ in points)
+        values = sorted(self.samples[phase][:filled])
+        return tuple(values[min(filled - 1, filled * p // 100)] * 1000 for p in points)
+
+    def summary(self):
+        """{phase: (p50, p95, p99)} in milliseconds, including the whole frame"""
+        return {phase: self.percentiles(phase) for phase in PHASES + ('frame',)}
+
+    def export(self, path):
+        """Write the trace as CSV (one row per frame) or Chrome trace JSON"""
+        frames = list(self.trace or ())
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(('frame', 'start_ms') + tuple(f"{phase}_ms" for phase in PHASES))
+                for index, (start, durations) in enumerate(frames):
+                    writer.writerow([index, f"{start * 1000:.3f}"] +
+                                    [f"{durations[phase] * 1000:.4f}" for phase in PHASES])
+        else:
+            # Trace Event Format, opens in chrome://tracing and Perfetto
+            events = []
+            for index, (start, durations) in enumerate(frames):
+                total = sum(durations.values())
+                events.append({'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                               'ts': start * 1e6, 'dur': total * 1e6, 'args': {'frame': index}})
+                offset = start
+                for phase in PHASES:
+                    duration = durations[phase]
+                    if duration:
+                        events.append({'name': phase, 'ph': 'X', 'pid': 1, 'tid': 1,
+                                       'ts': offset * 1e6, 'dur': duration * 1e6})
+                        offset += duration
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,66 @@
+"""
+Shinchan Jungle Run - Dirty Rectangle Tracking
+Remembers where each element was drawn last frame so only the regions
+that changed have to be pushed to the display.
+"""
+
+import pygame
+
+
+class DirtyRects:
+    def __init__(self, size, enabled=True, present=None):
+        self.enabled = enabled  # When off, flush() just flips the whole display
+        self.present = present  # Copies drawn rects to the window, returns window rects (see scaling.py)
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.previous = {}  # key -> (rect, state) from the last frame
+        self.current = {}
+        self.full = True  # First frame always pushes the whole screen
+
+    def add(self, key, rect, state=None):
+        """Record an element drawn this frame; state is anything that changes its pixels"""
+        if not self.enabled:
+            return
+        self.current[key] = (pygame.Rect(rect), state)
+
+    def invalidate(self):
+        """Force the next frame to update the whole screen"""
+        self.full = True
+
+    def collect(self):
+        """Finish the frame and return the list of rects that need updating"""
+        if self.full:
+            dirty = [self.screen_rect.copy()]
+        else:
+            dirty = []
+            for key, (rect, state) in self.current.items():
+                old = self.previous.get(key)
+                if old is None:
+                    dirty.append(rect)
+                elif old[0] != rect or old[1] != state:
+                    dirty.append(old[0].union(rect))
+            # Elements that disappeared leave a hole to repaint
+            for key, (rect, state) in self.previous.items():
+                if key not in self.current:
+                    dirty.append(rect)
+
+            dirty = [rect.clip(self.screen_rect) for rect in dirty]
+            dirty = [rect for rect in dirty if rect.width and rect.height]
+            if any(rect == self.screen_rect for rect in dirty):
+                dirty = [self.screen_rect.copy()]
+
+        self.previous = self.current
+        self.current = {}
+        self.full = False
+        return dirty
+
+    def flush(self):
+        """Push only the changed regions to the display"""
+        if not self.enabled:
+            if self.present is not None:
+                self.present([self.screen_rect])
+            pygame.display.flip()
+            return [self.screen_rect]
+        dirty = self.collect()
+        if dirty:
+            pygame.display.update(dirty if self.present is None else self.present(dirty))
+        return dirty
@@ -0,0 +1,174 @@
+"""
+Shinchan Jungle Run - Input Recording and Replay
+A run is fully determined by its seed, its tuning and the frames SPACE
+was pressed on, so that is all a recording holds.
+
+File layout (little endian):
+    header   b'SJRR', version (u8), seed (u64)
+    tuning   count (varint), then for each value that differs from the defaults:
+             index into TUNING (u8), type (u8: 0 int, 1 float), zigzag varint or f64
+             (version 2 on; version 1 recordings used the default tuning)
+    presses  count (varint), then frame deltas (varint each, 0 = same frame)
+    summary  frames (varint), score (varint), outcome (u8: 0 running, 1 lost, 2 won)
+"""
+
+import os
+import struct
+from engine import GameState
+from settings import TUNING
+from varint import TruncatedError, write_varint, write_signed, read_varint, read_signed
+
+MAGIC = b'SJRR'
+VERSION = 2
+HEADER = struct.Struct('<4sBQ')
+FLOAT = struct.Struct('<d')
+TUNING_NAMES = tuple(TUNING)
+
+RUNNING, LOST, WON = 0, 1, 2
+
+
+class ReplayError(Exception):
+    pass
+
+
+def outcome(game):
+    if game.game_won:
+        return WON
+    if game.game_over:
+        return LOST
+    return RUNNING
+
+
+def _write_tuning(out, tuning):
+    write_varint(out, len(tuning))
+    for name, value in tuning.items():
+        out.append(TUNING_NAMES.index(name))
+        if isinstance(value, int):
+            out.append(0)
+            write_signed(out, value)
+        else:
+            out.append(1)
+            out += FLOAT.pack(value)
+
+
+def _read_tuning(data, pos):
+    count, pos = read_varint(data, pos)
+    tuning = {}
+    for _ in range(count):
+        if pos + 2 > len(data):
+            raise ReplayError("Recording is truncated")
+        index, kind = data[pos], data[pos + 1]
+        pos += 2
+        if index >= len(TUNING_NAMES):
+            raise ReplayError(f"Unknown tuning value #{index} in recording")
+        if kind == 0:
+            value, pos = read_signed(data, pos)
+        else:
+            if pos + FLOAT.size > len(data):
+                raise ReplayError("Recording is truncated")
+            value, = FLOAT.unpack_from(data, pos)
+            pos += FLOAT.size
+        tuning[TUNING_NAMES[index]] = value
+    return tuning, pos
+
+
+def numbered_path(path, number):
+    """run.sjr, run-2.sjr, run-3.sjr... for successive runs in one session"""
+    if number <= 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{number}{ext}"
+
+
+class InputRecorder:
+    """Collects the frame index of every SPACE press during one run"""
+
+    def __init__(self, seed, tuning=None):
+        self.seed = seed
+        self.tuning = dict(tuning or {})  # Values the run changed from the defaults
+        self.presses = []
+
+    def press(self, frame):
+        self.presses.append(frame)
+
+    def encode(self, game):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed))
+        _write_tuning(out, self.tuning)
+        write_varint(out, len(self.presses))
+        previous = 0
+        for frame in self.presses:
+            write_varint(out, frame - previous)
+            previous = frame
+        write_varint(out, game.frame)
+        write_varint(out, game.score)
+        out.append(outcome(game))
+        return bytes(out)
+
+    def save(self, path, game):
+        with open(path, 'wb') as f:
+            f.write(self.encode(game))
+
+
+class Recording:
+    def __init__(self, seed, presses, frames, score, result, tuning=None):
+        self.seed = seed
+        self.tuning = tuning or {}
+        self.presses = presses
+        self.frames = frames
+        self.score = score
+        self.outcome = result
+
+
+def decode(data):
+    """Parse recording bytes into a Recording"""
+    if len(data) < HEADER.size:
+        raise ReplayError("Recording is truncated")
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError("Not a Shinchan Jungle Run recording")
+    if version not in (1, VERSION):
+        raise ReplayError(f"Unsupported recording version {version}")
+
+    pos = HEADER.size
+    tuning = {}
+    try:
+        if version >= 2:
+            tuning, pos = _read_tuning(data, pos)
+        count, pos = read_varint(data, pos)
+        presses = []
+        frame = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            frame += delta
+            presses.append(frame)
+        frames, pos = read_varint(data, pos)
+        score, pos = read_varint(data, pos)
+    except TruncatedError:
+        raise ReplayError("Recording is truncated")
+    if pos >= len(data):
+        raise ReplayError("Recording is truncated")
+    return Recording(seed, presses, frames, score, data[pos], tuning)
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+
+def replay(recording):
+    """Rebuild a run headlessly, returns (game, matches) where matches says the summary agreed"""
+    try:
+        game = GameState(recording.seed, recording.tuning)
+    except ValueError as e:
+        raise ReplayError(f"Recording has invalid tuning: {e}")
+    presses = recording.presses
+    next_press = 0
+    while game.frame < recording.frames and not game.finished:
+        # Presses logged on this frame were applied before its update
+        while next_press < len(presses) and presses[next_press] == game.frame:
+            game.jump()
+            next_press += 1
+        game.update()
+    matches = (game.frame == recording.frames and game.score == recording.score
+               and outcome(game) == recording.outcome)
+    return game, matches
@@ -0,0 +1,115 @@
+"""
+Shinchan Jungle Run - Resolution Scaling
+Everything is drawn at the fixed logical size from settings and scaled
+up once per frame on its way to the window, so drawing cost and image
+sizes stay the same however big the display is. The scale is a whole
+number picked from the desktop size (1 below 1080p, 2 on 1080p, 4 on
+4K), which keeps every logical pixel a sharp square. Images are loaded
+at the logical size in every tier, so there is one set of cached images.
+
+Modes:
+    window   plain logical-size window, no scaling
+    sdl      pygame.SCALED: SDL upscales on the GPU and maps the mouse back
+    texture  draw to an offscreen surface, one transform.scale into the window
+    auto     sdl when the desktop fits 2x or more, otherwise window
+"""
+
+import os
+import time
+import pygame
+from settings import WIDTH, HEIGHT
+
+MODES = ('auto', 'window', 'sdl', 'texture')
+MAX_SCALE = 4  # Biggest tier, 3200x1600 on a 4K display
+
+_active = None  # The ScaledDisplay get_mouse_pos() maps through
+
+
+def fit_scale(desktop_size, logical_size=(WIDTH, HEIGHT), max_scale=MAX_SCALE):
+    """Largest whole-number scale whose window still fits on the desktop"""
+    return max(1, min(max_scale, desktop_size[0] // logical_size[0], desktop_size[1] // logical_size[1]))
+
+
+def desktop_size():
+    try:
+        return pygame.display.get_desktop_sizes()[0]
+    except (pygame.error, IndexError):
+        return (WIDTH, HEIGHT)
+
+
+class ScaledDisplay:
+    def __init__(self, mode='auto', scale=None, logical_size=(WIDTH, HEIGHT)):
+        global _active
+        if mode not in MODES:
+            raise ValueError(f"Unknown scaling mode {mode!r}, expected one of {', '.join(MODES)}")
+        scale = scale or fit_scale(desktop_size(), logical_size)
+        if mode == 'auto':
+            mode = 'sdl' if scale > 1 else 'window'
+        self.mode = mode
+        self.logical_size = logical_size
+        if mode == 'texture':
+            self.scale = scale
+            self.window = pygame.display.set_mode((logical_size[0] * scale, logical_size[1] * scale))
+            self.surface = pygame.Surface(logical_size).convert()  # What the game draws on
+        elif mode == 'sdl':
+            # SDL picks the window size itself and scales on the GPU
+            self.window = self.surface = pygame.display.set_mode(logical_size, pygame.SCALED)
+            self.scale = max(1, pygame.display.get_window_size()[0] // logical_size[0])
+        else:
+            self.scale = 1
+            self.window = self.surface = pygame.display.set_mode(logical_size)
+        _active = self
+
+    @property
+    def offscreen(self):
+        return self.surface is not self.window
+
+    def present(self, rects):
+        """Scale the changed logical rects into the window, returns them in window coordinates"""
+        if not self.offscreen:
+            return rects
+        scale = self.scale
+        window_rects = []
+        for rect in rects:
+            target = pygame.Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
+            pygame.transform.scale(self.surface.subsurface(rect), target.size, self.window.subsurface(target))
+            window_rects.append(target)
+        return window_rects
+
+    def to_logical(self, pos):
+        if not self.offscreen:
+            return pos
+        return pos[0] // self.scale, pos[1] // self.scale
+
+
+def get_mouse_pos():
+    """Mouse position in logical coordinates (pygame.SCALED already maps it)"""
+    pos = pygame.mouse.get_pos()
+    return pos if _active is None else _active.to_logical(pos)
+
+
+def benchmark(scales=(1, 2, 3, 4), frames=100):
+    """ms to draw a logical frame and present it through texture scaling, per scale"""
+    image = pygame.Surface((WIDTH, HEIGHT))
+    image.fill((100, 150, 100))
+    pygame.draw.circle(image, (255, 215, 0), (WIDTH // 2, HEIGHT // 2), HEIGHT // 3)
+    results = {}
+    for scale in scales:
+        display = ScaledDisplay('texture', scale)
+        image = image.convert()
+        full = [display.surface.get_rect()]
+        display.surface.blit(image, (0, 0))
+        display.present(full)  # Warm up
+        start = time.perf_counter()
+        for _ in range(frames):
+            display.surface.blit(image, (0, 0))
+            pygame.display.update(display.present(full))
+        results[f"{WIDTH * scale}x{HEIGHT * scale}"] = (time.perf_counter() - start) / frames * 1000
+    return results
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    for size, ms in benchmark().items():
+        print(f"{size:>9}: {ms:.3f} ms per frame")
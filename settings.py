@@ -0,0 +1,48 @@
+"""
+Shinchan Jungle Run - Settings
+Screen, timing and gameplay constants shared by the engine, the level
+generator and the tools built on them.
+"""
+
+# Screen and timing
+WIDTH, HEIGHT = 800, 400
+FPS = 60
+FRAME_MS = 1000 / FPS  # Simulated milliseconds per fixed step
+MAX_CATCH_UP_STEPS = 5  # Steps a slow frame may run before the rest of its time is dropped
+
+# Gameplay tuning
+GROUND_Y = 300
+PLAYER_X = 100
+PLAYER_SIZE = 60
+START_SPEED = 5
+GRAVITY = 1
+JUMP_FORCE = -18
+DOUBLE_JUMP_FORCE = -16
+DOUBLE_JUMP_WINDOW = 300  # ms after the first jump
+ITEM_SPAWN_INTERVAL = 60  # frames
+OBSTACLE_SPAWN_INTERVAL = 90  # frames
+SPEED_STEP = 0.5  # Added to game_speed every SPEED_INTERVAL units
+SPEED_INTERVAL = 500
+PARENTS_DISTANCE = 1500
+GOAL_DISTANCE = 2000
+
+# Defaults for the values a GameState can be tuned with (see config.py and batch.py)
+TUNING = {
+    'start_speed': START_SPEED,
+    'gravity': GRAVITY,
+    'jump_force': JUMP_FORCE,
+    'double_jump_force': DOUBLE_JUMP_FORCE,
+    'double_jump_window': DOUBLE_JUMP_WINDOW,
+    'item_spawn_interval': ITEM_SPAWN_INTERVAL,
+    'obstacle_spawn_interval': OBSTACLE_SPAWN_INTERVAL,
+    'speed_step': SPEED_STEP,
+    'speed_interval': SPEED_INTERVAL,
+    'parents_distance': PARENTS_DISTANCE,
+    'goal_distance': GOAL_DISTANCE,
+}
+
+# Spawn layout
+ITEM_SIZE = 40
+ITEM_Y_RANGE = (200, 280)  # Random height, inclusive
+OBSTACLE_Y = 320
+OBSTACLE_SIZE = 60
@@ -0,0 +1,198 @@
+"""
+Shinchan Jungle Run - Network Snapshots
+Compact binary game state for spectators. A snapshot is always sent as
+the difference from a base the client has acknowledged: a bitmask of
+the scalar fields that changed followed by their zigzag varint deltas,
+then for each entity pool the entities that left, one shared scroll
+offset for everything that only moved with the world, the few that
+moved any other way, and the new arrivals. A full snapshot is the same
+encoding against an empty base, and so is any snapshot whose base is
+from an earlier run, because entity serials start again every run.
+
+Message layout:
+    seq (varint), base seq (varint, 0 = empty base), changed mask (varint),
+    one zigzag varint per changed scalar, then for each pool:
+        removed count, serial deltas
+        shift (zigzag)
+        moved count, (serial delta, dx, dy) each
+        added count, (serial delta, kind, x, y) each
+"""
+
+from varint import TruncatedError, write_varint, write_signed, read_varint, read_signed
+
+SCALE = 16  # Fixed-point steps per pixel for fractional values
+
+SCALARS = ('run', 'frame', 'distance', 'speed', 'player_y', 'parents_x', 'score',
+           'choco_count', 'pudding_count', 'jump_count', 'flags')
+SCALED = frozenset(('distance', 'speed', 'player_y', 'parents_x'))
+RUN = SCALARS.index('run')
+
+# flags bits
+GAME_OVER = 1
+GAME_WON = 2
+PARENTS_SPAWNED = 4
+
+KINDS = ('choco', 'pudding', 'obstacle')
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+EMPTY_SCALARS = (0,) * len(SCALARS)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class Snapshot:
+    __slots__ = ('seq', 'scalars', 'pools')
+
+    def __init__(self, seq, scalars, pools):
+        self.seq = seq
+        self.scalars = scalars  # Ints in SCALARS order, SCALED ones in 1/SCALE pixels
+        self.pools = pools  # (items, obstacles), each {serial: (kind code, x, y)}
+
+    def value(self, name):
+        value = self.scalars[SCALARS.index(name)]
+        return value / SCALE if name in SCALED else value
+
+
+EMPTY = Snapshot(0, EMPTY_SCALARS, ({}, {}))
+
+
+def capture(game, seq, run=0):
+    """Snapshot the parts of a GameState a spectator needs to draw it"""
+    flags = ((GAME_OVER if game.game_over else 0) | (GAME_WON if game.game_won else 0)
+             | (PARENTS_SPAWNED if game.parents_spawned else 0))
+    scalars = (run, game.frame, round(game.distance * SCALE), round(game.game_speed * SCALE),
+               round(game.player_y * SCALE), round(game.parents_x * SCALE), game.score,
+               game.choco_count, game.pudding_count, game.jump_count, flags)
+    pools = tuple({entity.serial: (KIND_CODES[entity.kind], entity.rect.x, entity.rect.y) for entity in pool}
+                  for pool in (game.items, game.obstacles))
+    return Snapshot(seq, scalars, pools)
+
+
+def same_run(snapshot, base):
+    """Entity serials start again every run, so only a base from the same run can be diffed against"""
+    return snapshot.scalars[RUN] == base.scalars[RUN]
+
+
+def encode(snapshot, base=EMPTY):
+    """Bytes that turn base into snapshot (a full snapshot when base is from another run)"""
+    if not same_run(snapshot, base):
+        base = EMPTY
+    out = bytearray()
+    write_varint(out, snapshot.seq)
+    write_varint(out, base.seq)
+
+    mask = 0
+    for i, (new, old) in enumerate(zip(snapshot.scalars, base.scalars)):
+        if new != old:
+            mask |= 1 << i
+    write_varint(out, mask)
+    for i, (new, old) in enumerate(zip(snapshot.scalars, base.scalars)):
+        if mask >> i & 1:
+            write_signed(out, new - old)
+
+    for pool, base_pool in zip(snapshot.pools, base.pools):
+        removed = sorted(serial for serial in base_pool if serial not in pool)
+        write_varint(out, len(removed))
+        previous = 0
+        for serial in removed:
+            write_varint(out, serial - previous)
+            previous = serial
+
+        # Everything that survived normally scrolled by the same amount
+        shift = 0
+        for serial, (kind, x, y) in pool.items():
+            old = base_pool.get(serial)
+            if old is not None:
+                shift = x - old[1]
+                break
+        write_signed(out, shift)
+        moved = []
+        added = []
+        for serial in sorted(pool):
+            kind, x, y = pool[serial]
+            old = base_pool.get(serial)
+            if old is None:
+                added.append(serial)
+            elif x - old[1] != shift or y != old[2]:
+                moved.append(serial)
+        write_varint(out, len(moved))
+        previous = 0
+        for serial in moved:
+            kind, x, y = pool[serial]
+            old = base_pool[serial]
+            write_varint(out, serial - previous)
+            write_signed(out, x - old[1] - shift)
+            write_signed(out, y - old[2])
+            previous = serial
+        write_varint(out, len(added))
+        previous = 0
+        for serial in added:
+            kind, x, y = pool[serial]
+            write_varint(out, serial - previous)
+            out.append(kind)
+            write_signed(out, x)
+            write_signed(out, y)
+            previous = serial
+    return bytes(out)
+
+
+def decode(data, bases):
+    """Rebuild a Snapshot from bytes; bases maps seq -> Snapshot the client still holds"""
+    try:
+        return _decode(data, bases)
+    except TruncatedError:
+        raise SnapshotError("Snapshot is truncated")
+
+
+def _decode(data, bases):
+    seq, pos = read_varint(data, 0)
+    base_seq, pos = read_varint(data, pos)
+    base = EMPTY if base_seq == 0 else bases.get(base_seq)
+    if base is None:
+        raise SnapshotError(f"Snapshot {seq} is based on {base_seq}, which is no longer held")
+
+    mask, pos = read_varint(data, pos)
+    scalars = list(base.scalars)
+    for i in range(len(SCALARS)):
+        if mask >> i & 1:
+            delta, pos = read_signed(data, pos)
+            scalars[i] += delta
+
+    pools = []
+    for base_pool in base.pools:
+        count, pos = read_varint(data, pos)
+        removed = set()
+        serial = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            serial += delta
+            removed.add(serial)
+        shift, pos = read_signed(data, pos)
+        pool = {serial: (kind, x + shift, y) for serial, (kind, x, y) in base_pool.items()
+                if serial not in removed}
+
+        count, pos = read_varint(data, pos)
+        serial = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            serial += delta
+            dx, pos = read_signed(data, pos)
+            dy, pos = read_signed(data, pos)
+            kind, x, y = pool[serial]
+            pool[serial] = (kind, x + dx, y + dy)
+
+        count, pos = read_varint(data, pos)
+        serial = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            serial += delta
+            if pos >= len(data):
+                raise SnapshotError("Snapshot is truncated")
+            kind = data[pos]
+            x, pos = read_signed(data, pos + 1)
+            y, pos = read_signed(data, pos)
+            pool[serial] = (kind, x, y)
+        pools.append(pool)
+    return Snapshot(seq, tuple(scalars), tuple(pools))
@@ -0,0 +1,100 @@
+"""
+Shinchan Jungle Run - Sound Manager
+The mixer is opened and sound effects are decoded on a background
+thread so the home screen doesn't wait for them; until an effect is
+ready, playing it is silent. Background music goes through
+pygame.mixer.music, which streams from the file instead of decoding it
+up front, and starts as soon as the mixer is open.
+"""
+
+import threading
+import time
+import pygame
+
+
+def load_sound_safe(path):
+    """Safely load sound or return silent sound"""
+    try:
+        return pygame.mixer.Sound(path)
+    except Exception as e:
+        return pygame.mixer.Sound(buffer=bytearray([]))  # Silent sound (missing or unreadable file)
+
+
+class SoundManager:
+    def __init__(self, paths):
+        self.paths = dict(paths)  # name -> file path
+        self.sounds = {}  # name -> loaded Sound, filled in by the loader thread
+        self.thread = None
+        self.created = time.perf_counter()
+        self.load_times = {}  # name -> ms spent decoding
+        self.mixer_ms = None  # ms spent opening the mixer
+        self.ready_ms = None  # ms from creation until every effect was loaded
+        self.lock = threading.Lock()
+        self.mixer_open = False
+        self.pending_music = None  # (path, volume) asked for before the mixer was open
+
+    def start(self):
+        """Begin decoding every effect in the background"""
+        self.thread = threading.Thread(target=self._load_all, name='sound-loader', daemon=True)
+        self.thread.start()
+
+    def _open_mixer(self):
+        start = time.perf_counter()
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error:
+            pass  # No audio device, every effect stays silent
+        self.mixer_ms = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.mixer_open = bool(pygame.mixer.get_init())
+            pending, self.pending_music = self.pending_music, None
+        if pending is not None:
+            self._start_music(*pending)
+
+    def _load_all(self):
+        self._open_mixer()
+        for name, path in self.paths.items():
+            start = time.perf_counter()
+            try:
+                self.sounds[name] = load_sound_safe(path)
+            except pygame.error:
+                pass  # Mixer unavailable, play() stays a no-op for this effect
+            self.load_times[name] = (time.perf_counter() - start) * 1000
+        self.ready_ms = (time.perf_counter() - self.created) * 1000
+
+    @property
+    def ready(self):
+        return self.ready_ms is not None
+
+    def wait(self, timeout=None):
+        """Block until the loader finishes (headless tools and benchmarks)"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self.ready
+
+    def play(self, name):
+        """Play an effect, silently skipped until it has loaded"""
+        sound = self.sounds.get(name)
+        if sound is not None and sound.get_length() > 0:  # Only play if sound exists
+            sound.play()
+
+    def play_music(self, path, volume=0.5):
+        """Stream a long track on loop once the mixer is open, silently skipped if it can't be opened"""
+        with self.lock:
+            if not self.mixer_open:
+                self.pending_music = (path, volume)
+                return
+        self._start_music(path, volume)
+
+    def _start_music(self, path, volume):
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1)
+        except (pygame.error, OSError):
+            pass
+
+    def metrics(self):
+        """Startup timings in milliseconds"""
+        return {'mixer_ms': self.mixer_ms, 'load_ms': dict(self.load_times), 'ready_ms': self.ready_ms}
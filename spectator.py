@@ -0,0 +1,372 @@
+"""
+Shinchan Jungle Run - Spectator Server
+One authoritative headless GameState, played by the autopilot, streamed
+over TCP to any number of watchers. Every third step the server takes a
+snapshot and sends each client the delta from the last snapshot that
+client acknowledged; clients acknowledging the same base share one
+encoded message. A client whose socket buffer is full simply skips
+snapshots until it drains (its next delta is taken against whatever it
+last acknowledged), so per-client memory stays bounded and a slow
+watcher never holds up the simulation or anyone else.
+
+Example:
+    python spectator.py serve --port 8765
+    python spectator.py watch --host 127.0.0.1 --port 8765
+    python spectator.py loadtest --clients 50 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import struct
+import sys
+import time
+from collections import OrderedDict
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from engine import GameState
+from bot import Autopilot
+from settings import FRAME_MS, MAX_CATCH_UP_STEPS, WIDTH, HEIGHT, PLAYER_X
+from snapshots import (EMPTY, GAME_OVER, GAME_WON, PARENTS_SPAWNED, KINDS, SnapshotError,
+                       capture, encode, decode, same_run)
+from varint import TruncatedError, write_varint, read_varint
+
+PORT = 8765
+LENGTH = struct.Struct('<I')  # Prefix on every message, both directions
+SEND_EVERY = 3  # Steps per snapshot, 20 snapshots a second
+SNAPSHOT_INTERVAL = SEND_EVERY * FRAME_MS / 1000
+HISTORY = 64  # Snapshots kept as delta bases, about 3 seconds
+BUFFER_LIMIT = 32 * 1024  # Unsent bytes past which a client skips snapshots
+STALL_SECONDS = 10  # A client that can't take a snapshot for this long is dropped
+RESTART_SECONDS = 2  # Pause on the end of a run before the next one starts
+
+
+class Watcher:
+    """Server-side state for one connection: a few counters, nothing that grows"""
+    __slots__ = ('writer', 'acked', 'sent_bytes', 'sent', 'skipped', 'last_send')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.acked = 0  # Last snapshot seq the client confirmed, 0 = nothing yet
+        self.sent_bytes = 0
+        self.sent = 0
+        self.skipped = 0
+        self.last_send = time.monotonic()
+
+
+class SpectatorServer:
+    def __init__(self, seed=None, tuning=None):
+        self.seed = seed
+        self.game = GameState(seed, tuning)
+        self.pilot = Autopilot(tuning)
+        self.run = 1
+        self.seq = 0
+        self.steps = 0
+        self.ended_steps = 0  # Steps since the current run finished
+        self.history = OrderedDict()  # seq -> Snapshot, the delta bases clients may hold
+        self.watchers = set()
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=PORT):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        watcher = Watcher(writer)
+        writer.transport.set_write_buffer_limits(high=BUFFER_LIMIT)
+        self.watchers.add(watcher)
+        try:
+            while True:
+                header = await reader.readexactly(LENGTH.size)
+                (size,) = LENGTH.unpack(header)
+                payload = await reader.readexactly(size)
+                acked, _ = read_varint(payload, 0)
+                watcher.acked = acked if acked in self.history else 0
+        except (asyncio.IncompleteReadError, ConnectionError, TruncatedError):
+            pass
+        finally:
+            self.watchers.discard(watcher)
+            writer.close()
+
+    async def simulate(self):
+        """Step at 60 Hz on the event loop's clock, dropping steps rather than spiralling when behind"""
+        loop = asyncio.get_running_loop()
+        step_seconds = FRAME_MS / 1000
+        next_step = loop.time()
+        while True:
+            now = loop.time()
+            steps = 0
+            while next_step <= now and steps < MAX_CATCH_UP_STEPS:
+                self.step()
+                next_step += step_seconds
+                steps += 1
+            if next_step <= now:
+                next_step = now
+            await asyncio.sleep(max(0.0, next_step - loop.time()))
+
+    def step(self):
+        game = self.game
+        if game.finished:
+            self.ended_steps += 1
+            if self.ended_steps * FRAME_MS >= RESTART_SECONDS * 1000:
+                game.reset(None if self.seed is None else self.seed + self.run)
+                self.pilot.reset()
+                self.run += 1
+                self.ended_steps = 0
+        else:
+            game.step(self.pilot(game))
+        self.steps += 1
+        if self.steps % SEND_EVERY == 0:
+            self.broadcast()
+
+    def broadcast(self):
+        self.seq += 1
+        snapshot = capture(self.game, self.seq, self.run)
+        self.history[self.seq] = snapshot
+        while len(self.history) > HISTORY:
+            self.history.popitem(last=False)
+
+        messages = {}  # base seq -> framed message, shared by every watcher on that base
+        now = time.monotonic()
+        for watcher in list(self.watchers):
+            transport = watcher.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > BUFFER_LIMIT:
+                # Backpressure: skip this one, the next delta covers it
+                watcher.skipped += 1
+                if now - watcher.last_send > STALL_SECONDS:
+                    watcher.writer.close()
+                continue
+            base = self.history.get(watcher.acked, EMPTY)
+            if not same_run(snapshot, base):
+                base = EMPTY  # Shared with everyone else still on the previous run
+            message = messages.get(base.seq)
+            if message is None:
+                payload = encode(snapshot, base)
+                message = LENGTH.pack(len(payload)) + payload
+                messages[base.seq] = message
+            watcher.writer.write(message)
+            watcher.sent += 1
+            watcher.sent_bytes += len(message)
+            watcher.last_send = now
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        for watcher in list(self.watchers):
+            watcher.writer.close()
+        self.game.close()
+
+
+class SpectatorClient:
+    """Receives and acknowledges snapshots, keeping the latest two for interpolation"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.bases = OrderedDict()  # seq -> Snapshot, trimmed to HISTORY
+        self.previous = None
+        self.latest = None
+        self.latest_time = 0.0
+        self.received = 0
+        self.received_bytes = 0
+        self.resyncs = 0
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def receive(self):
+        """Read snapshots until the server goes away"""
+        try:
+            while True:
+                header = await self.reader.readexactly(LENGTH.size)
+                (size,) = LENGTH.unpack(header)
+                payload = await self.reader.readexactly(size)
+                self.received += 1
+                self.received_bytes += LENGTH.size + size
+                try:
+                    snapshot = decode(payload, self.bases)
+                except SnapshotError:
+                    # Lost our base, ask for a full snapshot
+                    self.resyncs += 1
+                    self.ack(0)
+                    continue
+                self.bases[snapshot.seq] = snapshot
+                while len(self.bases) > HISTORY:
+                    self.bases.popitem(last=False)
+                self.previous, self.latest = self.latest, snapshot
+                self.latest_time = time.perf_counter()
+                self.ack(snapshot.seq)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def ack(self, seq):
+        out = bytearray()
+        write_varint(out, seq)
+        self.writer.write(LENGTH.pack(len(out)) + out)
+
+    def view(self):
+        """(alpha, previous, latest) for drawing between the last two snapshots"""
+        if self.latest is None:
+            return 1.0, None, None
+        alpha = min(1.0, (time.perf_counter() - self.latest_time) / SNAPSHOT_INTERVAL)
+        previous = self.previous
+        if previous is None or previous.value('run') != self.latest.value('run'):
+            previous = self.latest  # Don't slide between two different runs
+        return alpha, previous, self.latest
+
+    def close(self):
+        self.writer.close()
+
+
+def lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+async def watch(host, port):
+    """Thin pygame client drawing the stream with interpolation"""
+    import pygame
+    from main import load_image_safe
+    from fonts import render_text
+    from parallax import ParallaxBackground, single_layer
+    from sprites import SpriteBatch
+
+    client = await SpectatorClient.connect(host, port)
+    receiver = asyncio.create_task(client.receive())
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Shinchan's Jungle Run - Spectating")
+    bg_img = load_image_safe("assets/shinchan_files/jungle_bg.png", (WIDTH, HEIGHT), (100, 150, 100), "BG")
+    images = {
+        'choco': load_image_safe("assets/shinchan_files/chocobee.png", (50, 50), (255, 215, 0), "CHOCO"),
+        'pudding': load_image_safe("assets/shinchan_files/pudding.png", (50, 50), (150, 100, 200), "PUDDING"),
+        'obstacle': load_image_safe("assets/shinchan_files/obstacle.png", (100, 100), (120, 80, 60), "OBSTACLE"),
+    }
+    player_img = load_image_safe("assets/shinchan_files/shinchan.png", (80, 80), (255, 150, 150), "SHINCHAN")
+    parents_img = load_image_safe("assets/shinchan_files/parents.png", (100, 180), (200, 150, 150), "PARENTS")
+    background = ParallaxBackground(single_layer(bg_img), (WIDTH, HEIGHT))
+    sprites = SpriteBatch(['items', 'obstacles', 'actors'])
+
+    running = True
+    try:
+        while running and not receiver.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    running = False
+
+            alpha, previous, latest = client.view()
+            if latest is None:
+                screen.fill((200, 240, 200))
+                screen.blit(render_text("Waiting for the server...", 30, (0, 0, 0)), (250, 180))
+            else:
+                background.draw(screen, lerp(previous.value('distance'), latest.value('distance'), alpha))
+                for layer, pool, old_pool in zip(('items', 'obstacles'), latest.pools, previous.pools):
+                    for serial, (kind, x, y) in pool.items():
+                        old = old_pool.get(serial)
+                        draw_x = lerp(old[1], x, alpha) if old is not None else x
+                        sprites[layer].add(images[KINDS[kind]], (round(draw_x), y))
+                flags = latest.value('flags')
+                if flags & PARENTS_SPAWNED:
+                    parents_x = lerp(previous.value('parents_x'), latest.value('parents_x'), alpha)
+                    sprites['actors'].add(parents_img, (round(parents_x), 220))
+                player_y = lerp(previous.value('player_y'), latest.value('player_y'), alpha)
+                sprites['actors'].add(player_img, (PLAYER_X, round(player_y)))
+                sprites.draw(screen)
+
+                screen.blit(render_text(f"Score: {latest.value('score')}", 25, (0, 0, 0)), (20, 20))
+                screen.blit(render_text(f"Run {latest.value('run')} - spectating", 18, (0, 0, 0)), (20, 50))
+                if flags & (GAME_OVER | GAME_WON):
+                    text = "YOU WIN!" if flags & GAME_WON else "GAME OVER"
+                    banner = render_text(text, 60, (255, 215, 0) if flags & GAME_WON else (255, 0, 0))
+                    screen.blit(banner, banner.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
+            pygame.display.flip()
+            await asyncio.sleep(1 / 60)
+    finally:
+        client.close()
+        receiver.cancel()
+        pygame.quit()
+
+
+async def serve(host, port, seed):
+    server = SpectatorServer(seed)
+    port = await server.start(host, port)
+    print(f"Spectator server on {host}:{port}")
+    try:
+        await server.simulate()
+    finally:
+        server.close()
+
+
+async def loadtest(clients, seconds, seed=0):
+    """Run a server and headless watchers over loopback, returns the measurements"""
+    server = SpectatorServer(seed)
+    port = await server.start('127.0.0.1', 0)
+    watchers = [await SpectatorClient.connect('127.0.0.1', port) for _ in range(clients)]
+    tasks = [asyncio.create_task(watcher.receive()) for watcher in watchers]
+    simulation = asyncio.create_task(server.simulate())
+
+    cpu = time.process_time()
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+
+    simulation.cancel()
+    for watcher in watchers:
+        watcher.close()
+    await asyncio.gather(*tasks)  # Each ends once the server sees the hang-up and closes its side
+    server.close()
+    await asyncio.sleep(0.1)  # Let the server's handlers finish
+    received = sum(watcher.received for watcher in watchers)
+    received_bytes = sum(watcher.received_bytes for watcher in watchers)
+    return {
+        'clients': clients,
+        'snapshots_per_client_s': received / clients / elapsed,
+        'bytes_per_client_s': received_bytes / clients / elapsed,
+        'bytes_per_snapshot': received_bytes / max(1, received),
+        'cpu_share': cpu / elapsed,  # Of one core, server and every client together
+        'resyncs': sum(watcher.resyncs for watcher in watchers),
+        'run': server.run,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream an autopilot race to spectators")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help='run the authoritative simulation')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='use 0.0.0.0 to accept LAN watchers')
+    serve_parser.add_argument('--port', type=int, default=PORT)
+    serve_parser.add_argument('--seed', type=int, help='seed of the first run, later runs count up from it')
+    watch_parser = commands.add_parser('watch', help='open a window on a running server')
+    watch_parser.add_argument('--host', default='127.0.0.1')
+    watch_parser.add_argument('--port', type=int, default=PORT)
+    load_parser = commands.add_parser('loadtest', help='server plus headless watchers over loopback')
+    load_parser.add_argument('--clients', type=int, default=50)
+    load_parser.add_argument('--seconds', type=float, default=10)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        if args.command == 'serve':
+            asyncio.run(serve(args.host, args.port, args.seed))
+        elif args.command == 'watch':
+            asyncio.run(watch(args.host, args.port))
+        else:
+            result = asyncio.run(loadtest(args.clients, args.seconds))
+            print(f"{result['clients']} watchers: {result['snapshots_per_client_s']:.1f} snapshots/s and "
+                  f"{result['bytes_per_client_s']:.0f} B/s each, {result['bytes_per_snapshot']:.1f} B/snapshot, "
+                  f"{result['cpu_share']:.0%} of one core in total, {result['resyncs']} resyncs")
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
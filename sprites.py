@@ -0,0 +1,109 @@
+"""
+Shinchan Jungle Run - Batched Sprite Layers
+Entities are queued into layers each frame and every layer is pushed
+to the screen with one Surface.blits() call, so drawing a crowd costs
+one trip into SDL per layer instead of one per entity. Layers draw back
+to front in the order they were declared.
+
+Run this file directly for the 1,000-entity benchmark against one blit
+per entity and a pygame.sprite.Group.
+"""
+
+import os
+import random
+import time
+import pygame
+
+
+class SpriteLayer:
+    __slots__ = ('name', 'sequence', 'keys')
+
+    def __init__(self, name):
+        self.name = name
+        self.sequence = []  # (image, dest) pairs for Surface.blits()
+        self.keys = []  # (key, state) per pair, for dirty-rect tracking
+
+    def add(self, image, dest, key=None, state=None):
+        self.sequence.append((image, dest))
+        self.keys.append((key, state))
+
+    def clear(self):
+        self.sequence.clear()
+        self.keys.clear()
+
+
+class SpriteBatch:
+    def __init__(self, names):
+        self.layers = [SpriteLayer(name) for name in names]
+        self.by_name = {layer.name: layer for layer in self.layers}
+
+    def __getitem__(self, name):
+        return self.by_name[name]
+
+    def draw(self, screen, tracker=None):
+        """Blit every layer with one call each, then empty them for the next frame"""
+        track = tracker is not None and tracker.enabled
+        for layer in self.layers:
+            if not layer.sequence:
+                continue
+            if track:
+                rects = screen.blits(layer.sequence)
+                for (key, state), rect in zip(layer.keys, rects):
+                    tracker.add(key, rect, state)
+            else:
+                screen.blits(layer.sequence, doreturn=False)
+            layer.clear()
+
+
+def benchmark(count=1000, frames=300, size=(800, 400)):
+    """Draw count entities per frame three ways, returns ms per frame for each"""
+    screen = pygame.display.get_surface() or pygame.display.set_mode(size)
+    width, height = size
+    rng = random.Random(1)
+    images = []
+    for color in ((255, 215, 0), (150, 100, 200), (120, 80, 60)):
+        image = pygame.Surface((50, 50), pygame.SRCALPHA)
+        pygame.draw.circle(image, color, (25, 25), 24)
+        images.append(image.convert_alpha())
+    entities = [(rng.choice(images), pygame.Rect(rng.randrange(width), rng.randrange(height), 50, 50))
+                for _ in range(count)]
+
+    group = pygame.sprite.Group()
+    for image, rect in entities:
+        sprite = pygame.sprite.Sprite()
+        sprite.image = image
+        sprite.rect = rect
+        group.add(sprite)
+
+    batch = SpriteBatch(['entities'])
+    layer = batch['entities']
+
+    def per_entity():
+        for image, rect in entities:
+            screen.blit(image, rect)
+
+    def sprite_group():
+        group.draw(screen)
+
+    def batched():
+        for image, rect in entities:
+            layer.add(image, rect)
+        batch.draw(screen)
+
+    results = {}
+    for name, draw in (('per_entity', per_entity), ('sprite_group', sprite_group), ('batched', batched)):
+        draw()  # Warm up
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw()
+        results[name] = (time.perf_counter() - start) / frames * 1000
+    return results
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.display.set_mode((800, 400))
+    for count in (10, 100, 1000):
+        results = benchmark(count)
+        print(f"{count:>5} entities: " + ', '.join(f"{name} {ms:.3f} ms" for name, ms in results.items()))
@@ -0,0 +1,68 @@
+"""
+Shinchan Jungle Run - Staged Startup
+Only what the home screen needs is set up before its first frame; the
+game's images load on a background thread while the menu is showing.
+Every phase is timed for --startup-report.
+"""
+
+import threading
+import time
+
+
+class StartupTimer:
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.last = self.origin
+        self.phases = []  # (name, start, end) in perf_counter seconds, main thread and background
+        self.lock = threading.Lock()
+
+    def mark(self, name):
+        """Close a main-thread phase that started at the previous mark"""
+        now = time.perf_counter()
+        self.record(name, self.last, now)
+        self.last = now
+
+    def record(self, name, start, end):
+        """Add a phase timed elsewhere (e.g. on a loader thread)"""
+        with self.lock:
+            self.phases.append((name, start, end))
+
+    def report(self):
+        """Lines of the timing breakdown, in milliseconds from launch"""
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+        lines = [f"{'phase':<22}{'took':>9}{'from':>9}{'to':>9}   (ms since launch)"]
+        for name, start, end in phases:
+            lines.append(f"{name:<22}{(end - start) * 1000:>9.1f}"
+                         f"{(start - self.origin) * 1000:>9.1f}{(end - self.origin) * 1000:>9.1f}")
+        return lines
+
+
+class BackgroundLoader:
+    """Runs named load jobs one after another on a daemon thread"""
+
+    def __init__(self, jobs, timer=None):
+        self.jobs = list(jobs)  # (name, callable) pairs
+        self.results = {}
+        self.timer = timer
+        self.thread = threading.Thread(target=self._run, name='asset-loader', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        for name, job in self.jobs:
+            start = time.perf_counter()
+            self.results[name] = job()
+            if self.timer is not None:
+                self.timer.record(f"load {name}", start, time.perf_counter())
+
+    @property
+    def ready(self):
+        return not self.thread.is_alive() and len(self.results) == len(self.jobs)
+
+    def wait(self):
+        """Block until every job has run, returns {name: result}"""
+        self.thread.join()
+        return self.results
@@ -0,0 +1,200 @@
+"""
+Shinchan Jungle Run - Run Telemetry and Leaderboard
+Every finished run is stored in a local SQLite file. The game loop only
+drops the run onto a queue; a writer thread owns the connection and
+commits whatever has queued up in one transaction, so disk I/O never
+lands on a frame. The top scores are read through an index and kept in
+memory, so the end screen never waits on the database.
+
+Frame times for the run are counted into a fixed-bucket histogram that
+is cleared when a run starts, so the stored percentiles cover every
+frame of the run however long it lasts, not just the profiler's recent
+window.
+"""
+
+import os
+import queue
+import threading
+import time
+from array import array
+
+DB_PATH = 'scores.db'
+BATCH_SIZE = 64  # Most runs written per transaction
+FLUSH_INTERVAL = 1.0  # Seconds the writer waits for more runs before committing
+LEADERBOARD_SIZE = 5
+BUCKET_MS = 0.05  # Frame time histogram resolution
+BUCKETS = 4000  # Covers 0-200 ms, anything slower lands in the last bucket
+
+FIELDS = ('started', 'seed', 'outcome', 'score', 'choco_count', 'pudding_count', 'distance',
+          'frames', 'duration_ms', 'jumps', 'double_jumps', 'frame_p50_ms', 'frame_p95_ms',
+          'frame_p99_ms', 'autopilot')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    choco_count INTEGER NOT NULL,
+    pudding_count INTEGER NOT NULL,
+    distance REAL NOT NULL,
+    frames INTEGER NOT NULL,
+    duration_ms REAL NOT NULL,
+    jumps INTEGER NOT NULL,
+    double_jumps INTEGER NOT NULL,
+    frame_p50_ms REAL,
+    frame_p95_ms REAL,
+    frame_p99_ms REAL,
+    autopilot INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_leaderboard ON runs (autopilot, score DESC, id);
+"""
+
+LEADERBOARD_QUERY = ("SELECT score, outcome, distance, started FROM runs "
+                     "WHERE autopilot = 0 ORDER BY score DESC, id LIMIT ?")
+
+
+class FrameHistogram:
+    """Every frame time of one run in fixed buckets, adding one is O(1) and never allocates"""
+
+    def __init__(self):
+        self.counts = array('L', bytes(array('L').itemsize * BUCKETS))
+        self.count = 0
+        self.slowest = 0.0
+
+    def reset(self):
+        if self.count:
+            self.counts = array('L', bytes(array('L').itemsize * BUCKETS))
+            self.count = 0
+            self.slowest = 0.0
+
+    def add(self, ms):
+        self.counts[min(int(ms / BUCKET_MS), BUCKETS - 1)] += 1
+        self.count += 1
+        if ms > self.slowest:
+            self.slowest = ms
+
+    def percentiles(self, points=(50, 95, 99)):
+        """Frame time in milliseconds at each percentile (bucket upper edge), None before any frame"""
+        if not self.count:
+            return tuple(None for _ in points)
+        results = []
+        for p in points:
+            rank = min(self.count - 1, self.count * p // 100)  # Same rank rule as the profiler
+            seen = 0
+            for bucket, count in enumerate(self.counts):
+                seen += count
+                if seen > rank:
+                    break
+            results.append(min(round((bucket + 1) * BUCKET_MS, 3), self.slowest))
+        return tuple(results)
+
+
+def run_record(game, outcome, duration_ms, frame_stats=(None, None, None), autopilot=False):
+    """One runs-table row for a game, in FIELDS order"""
+    p50, p95, p99 = frame_stats
+    return (time.time(), game.seed, outcome, game.score, game.choco_count, game.pudding_count,
+            game.distance, game.frame, duration_ms, game.jumps, game.double_jumps, p50, p95, p99,
+            int(bool(autopilot)))
+
+
+class TelemetryStore:
+    def __init__(self, path=DB_PATH, leaderboard_size=LEADERBOARD_SIZE):
+        self.path = path
+        self.leaderboard_size = leaderboard_size
+        self.leaderboard = ()  # (score, outcome, distance, started) best first, swapped in whole
+        self.queue = queue.Queue()
+        self.written = 0
+        self.batches = 0
+        self.error = None  # Last database error, the game carries on without telemetry
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._write_loop, name='telemetry-writer', daemon=True)
+        self.thread.start()
+
+    def record(self, row):
+        """Queue a run_record() row; never blocks"""
+        self.queue.put(row)
+        if not row[FIELDS.index('autopilot')]:
+            # Show the run on the leaderboard straight away, the database catches up later
+            score, outcome, distance, started = (row[FIELDS.index(name)]
+                                                 for name in ('score', 'outcome', 'distance', 'started'))
+            with self.lock:
+                board = sorted(self.leaderboard + ((score, outcome, distance, started),),
+                               key=lambda entry: (-entry[0], entry[3]))
+                self.leaderboard = tuple(board[:self.leaderboard_size])
+
+    def _connect(self):
+        import sqlite3
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _write_loop(self):
+        import sqlite3  # Imported here so it loads on the writer thread, not before the first frame
+        try:
+            connection = self._connect()
+            self._load_leaderboard(connection)
+        except sqlite3.Error as e:
+            self.error = e
+            connection = None
+
+        insert = f"INSERT INTO runs ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})"
+        stopping = False
+        while not stopping:
+            row = self.queue.get()
+            if row is None:
+                break
+            # Gather everything else that arrives shortly after into the same transaction
+            batch = [row]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                try:
+                    row = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            if connection is None:
+                continue
+            try:
+                with connection:
+                    connection.executemany(insert, batch)
+                self.written += len(batch)
+                self.batches += 1
+            except sqlite3.Error as e:
+                self.error = e
+        if connection is not None:
+            connection.close()
+
+    def _load_leaderboard(self, connection):
+        rows = connection.execute(LEADERBOARD_QUERY, (self.leaderboard_size,)).fetchall()
+        with self.lock:
+            # Keep anything recorded before the load finished
+            merged = sorted(set(self.leaderboard) | set(map(tuple, rows)),
+                            key=lambda entry: (-entry[0], entry[3]))
+            self.leaderboard = tuple(merged[:self.leaderboard_size])
+
+    def close(self, timeout=5):
+        """Write whatever is still queued and stop the writer"""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+
+def history(path=DB_PATH, limit=20):
+    """Most recent runs as dicts (for quick inspection from a shell)"""
+    import sqlite3
+    connection = sqlite3.connect(path)
+    try:
+        rows = connection.execute(f"SELECT {', '.join(FIELDS)} FROM runs ORDER BY id DESC LIMIT ?",
+                                  (limit,)).fetchall()
+    finally:
+        connection.close()
+    return [dict(zip(FIELDS, row)) for row in rows]
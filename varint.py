@@ -0,0 +1,45 @@
+"""
+Shinchan Jungle Run - Varint Codec
+Unsigned LEB128 varints (7 bits per byte, high bit set on every byte
+but the last) and zigzag-mapped signed ones, so small values of either
+sign take one byte. Shared by the recording and snapshot formats.
+"""
+
+
+class TruncatedError(Exception):
+    """The data ended in the middle of a varint"""
+
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def write_signed(out, value):
+    write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+
+
+def read_varint(data, pos):
+    """(value, position after it)"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise TruncatedError("Data ends inside a varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def read_signed(data, pos):
+    value, pos = read_varint(data, pos)
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos